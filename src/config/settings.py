@@ -482,9 +482,12 @@ def get_reports_path() -> Path:
     """Retorna caminho para relatórios."""
     return settings.system.reports_dir
 
+# Nomes sensíveis normalizados uma vez, para busca O(1)
+_SENSITIVE_COLUMNS_UPPER = frozenset(col.upper() for col in SENSITIVE_COLUMNS)
+
 def is_column_sensitive(column_name: str) -> bool:
     """Verifica se coluna contém dados sensíveis."""
-    return column_name.upper() in [col.upper() for col in SENSITIVE_COLUMNS]
+    return column_name.upper() in _SENSITIVE_COLUMNS_UPPER
 
 def get_metric_threshold(metric_name: str, threshold_type: str) -> Optional[float]:
     """Obtém limiar de alerta para métrica específica."""
@@ -3,6 +3,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Union
 import warnings
+from functools import lru_cache
 from pathlib import Path
 import re
 
@@ -14,6 +15,41 @@ warnings.filterwarnings('ignore', category=pd.errors.DtypeWarning)
 
 logger = get_logger(__name__)
 
+# Colunas de texto viram category quando (valores únicos / linhas) fica abaixo disto
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Inteiros candidatos para redução, do menor para o maior
+_INT_CANDIDATES = (np.int8, np.int16, np.int32)
+_UINT_CANDIDATES = (np.uint8, np.uint16, np.uint32)
+
+
+@lru_cache(maxsize=32)
+def _plan_dtypes(schema_sig: Tuple[Tuple[str, str], ...]) -> Dict[str, str]:
+    """
+    Classifica, apenas pelo schema, o tipo de redução de cada coluna.
+    
+    Memorizado por assinatura de schema; só a classificação dos dtypes é
+    reaproveitada, os valores de cada coluna são analisados em _apply_plan.
+    
+    Args:
+        schema_sig: Tupla de pares (coluna, dtype)
+        
+    Returns:
+        Dict coluna -> tipo de redução ('float', 'integer', 'unsigned' ou 'category')
+    """
+    plan = {}
+    for col, dtype in schema_sig:
+        if dtype.startswith('float'):
+            plan[col] = 'float'
+        elif dtype.startswith('uint'):
+            plan[col] = 'unsigned'
+        elif dtype.startswith('int'):
+            plan[col] = 'integer'
+        elif dtype in ('object', 'str', 'string'):
+            plan[col] = 'category'
+    return plan
+
+
 class SRAGDataProcessor:
     """
     Processador principal de dados SRAG do DataSUS.
@@ -84,6 +120,7 @@ class SRAGDataProcessor:
             
             # Processar dados
             processed_data = self._process_data_pipeline(raw_data)
+            processed_data = self._optimize_memory_usage(processed_data)
             
             # Estatísticas finais
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -305,4 +342,60 @@ class SRAGDataProcessor:
         """
         return self.processing_stats
 
+    def _optimize_memory_usage(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reduz o uso de memória do DataFrame com dtypes mais estreitos.
+        
+        Args:
+            data: DataFrame a otimizar (não é modificado)
+            
+        Returns:
+            DataFrame com dtypes reduzidos
+        """
+        schema_sig = tuple((col, str(dtype)) for col, dtype in data.dtypes.items())
+        return self._apply_plan(data, _plan_dtypes(schema_sig))
+
+    @staticmethod
+    def _apply_plan(data: pd.DataFrame, plan: Dict[str, str]) -> pd.DataFrame:
+        """
+        Escolhe o dtype final de cada coluna do plano e converte em um único astype.
+        
+        Args:
+            data: DataFrame a otimizar
+            plan: Plano gerado por _plan_dtypes
+            
+        Returns:
+            DataFrame convertido (o próprio `data` se nada mudar)
+        """
+        n_rows = len(data.index)
+        if n_rows == 0:
+            return data
+        
+        targets = {}
+        for col, kind in plan.items():
+            if kind == 'category':
+                try:
+                    n_unique = data[col].nunique()
+                except TypeError:
+                    # Valores não hasheáveis (ex.: dicts) não viram category
+                    continue
+                if n_unique / n_rows < CATEGORY_MAX_UNIQUE_RATIO:
+                    targets[col] = 'category'
+            elif kind == 'float':
+                # Só reduz se todos os valores sobreviverem à ida e volta
+                values = data[col].to_numpy()
+                with np.errstate(over='ignore'):
+                    exact = np.array_equal(values, values.astype(np.float32), equal_nan=True)
+                if exact:
+                    targets[col] = np.float32
+            else:
+                col_min, col_max = data[col].min(), data[col].max()
+                candidates = _UINT_CANDIDATES if kind == 'unsigned' else _INT_CANDIDATES
+                for candidate in candidates:
+                    info = np.iinfo(candidate)
+                    if info.min <= col_min and col_max <= info.max:
+                        targets[col] = candidate
+                        break
+        
+        return data.astype(targets) if targets else data
 
@@ -41,7 +41,7 @@ class MetricsCalculatorTool(BaseTool):
         Apenas para dados muito antigos (>3 anos), ajusta para a última data disponível.
         """
         try:
-            if data is None or len(data) == 0 or 'DT_NOTIFIC' not in data.columns:
+            if data is None or len(data.index) == 0 or 'DT_NOTIFIC' not in data.columns:
                 return reference_date
             
             # Converter para datetime
@@ -67,6 +67,40 @@ class MetricsCalculatorTool(BaseTool):
             logger.warning(f"Erro ao detectar data: {e}")
             return reference_date
     
+    def _filter_period(
+        self, 
+        data: pd.DataFrame, 
+        start_date: datetime, 
+        end_date: datetime
+    ) -> pd.DataFrame:
+        """
+        Seleciona os registros notificados entre `start_date` e `end_date`.
+        
+        As datas de notificação são convertidas numa variável local, sem
+        alterar o DataFrame do chamador. DataFrames sem linhas são devolvidos
+        como estão, sem conversão nem filtro.
+        
+        Args:
+            data: DataFrame com coluna DT_NOTIFIC
+            start_date: Início do período (inclusive)
+            end_date: Fim do período (inclusive)
+            
+        Returns:
+            Cópia dos registros do período
+            
+        Raises:
+            ValueError: Se houver registros sem a coluna DT_NOTIFIC
+        """
+        if len(data.index) == 0:
+            return data
+        
+        if 'DT_NOTIFIC' not in data.columns:
+            raise ValueError("Coluna DT_NOTIFIC não encontrada nos dados")
+        
+        notific_dates = pd.to_datetime(data['DT_NOTIFIC'])
+        period_mask = (notific_dates >= start_date) & (notific_dates <= end_date)
+        return data[period_mask].copy()
+    
     async def calculate_case_increase_rate(
         self, 
         data: pd.DataFrame, 
@@ -87,7 +121,7 @@ class MetricsCalculatorTool(BaseTool):
         try:
             logger.info(f"Calculando taxa de aumento de casos - período: {period_days} dias")
             
-            if len(data) == 0 or 'DT_NOTIFIC' not in data.columns:
+            if len(data.index) == 0 or 'DT_NOTIFIC' not in data.columns:
                 return {
                     'rate': 0.0,
                     'interpretation': "Sem dados disponíveis para o período analisado",
@@ -113,22 +147,23 @@ class MetricsCalculatorTool(BaseTool):
             previous_end = current_start
             previous_start = previous_end - timedelta(days=period_days)
             
-            # Filtrar dados para cada período
-            data['DT_NOTIFIC'] = pd.to_datetime(data['DT_NOTIFIC'])
+            # Filtrar dados para cada período (conversão local: o DataFrame
+            # do chamador não é alterado)
+            notific_dates = pd.to_datetime(data['DT_NOTIFIC'])
             
             # Casos do período atual
             current_mask = (
-                (data['DT_NOTIFIC'] >= current_start) & 
-                (data['DT_NOTIFIC'] <= current_end)
+                (notific_dates >= current_start) & 
+                (notific_dates <= current_end)
             )
-            current_cases = len(data[current_mask])
+            current_cases = int(current_mask.sum())
             
             # Casos do período anterior
             previous_mask = (
-                (data['DT_NOTIFIC'] >= previous_start) & 
-                (data['DT_NOTIFIC'] <= previous_end)
+                (notific_dates >= previous_start) & 
+                (notific_dates <= previous_end)
             )
-            previous_cases = len(data[previous_mask])
+            previous_cases = int(previous_mask.sum())
             
             # Calcular taxa de aumento
             if previous_cases == 0:
@@ -210,16 +245,11 @@ class MetricsCalculatorTool(BaseTool):
             start_date = ref_date - timedelta(days=period_days)
             
             # Filtrar dados
-            data['DT_NOTIFIC'] = pd.to_datetime(data['DT_NOTIFIC'])
-            period_mask = (
-                (data['DT_NOTIFIC'] >= start_date) & 
-                (data['DT_NOTIFIC'] <= ref_date)
-            )
-            period_data = data[period_mask].copy()
+            period_data = self._filter_period(data, start_date, ref_date)
             
             logger.info(f"Registros no período: {len(period_data)}")
             
-            if len(period_data) == 0:
+            if len(period_data.index) == 0:
                 return {
                     'rate': 0.0,
                     'interpretation': "Sem dados para o período analisado",
@@ -316,16 +346,11 @@ class MetricsCalculatorTool(BaseTool):
             start_date = ref_date - timedelta(days=period_days)
             
             # Filtrar dados
-            data['DT_NOTIFIC'] = pd.to_datetime(data['DT_NOTIFIC'])
-            period_mask = (
-                (data['DT_NOTIFIC'] >= start_date) & 
-                (data['DT_NOTIFIC'] <= ref_date)
-            )
-            period_data = data[period_mask].copy()
+            period_data = self._filter_period(data, start_date, ref_date)
             
             logger.info(f"Registros no período: {len(period_data)}")
             
-            if len(period_data) == 0:
+            if len(period_data.index) == 0:
                 return {
                     'rate': 0.0,
                     'interpretation': "Sem dados para o período analisado",
@@ -438,16 +463,11 @@ class MetricsCalculatorTool(BaseTool):
             start_date = ref_date - timedelta(days=period_days)
             
             # Filtrar dados
-            data['DT_NOTIFIC'] = pd.to_datetime(data['DT_NOTIFIC'])
-            period_mask = (
-                (data['DT_NOTIFIC'] >= start_date) & 
-                (data['DT_NOTIFIC'] <= ref_date)
-            )
-            period_data = data[period_mask].copy()
+            period_data = self._filter_period(data, start_date, ref_date)
             
             logger.info(f"Registros no período: {len(period_data)}")
             
-            if len(period_data) == 0:
+            if len(period_data.index) == 0:
                 return self._empty_vaccination_result(reference_date, period_days)
             
             total_cases = len(period_data)
@@ -14,6 +14,9 @@ from ..utils.llm_gemini import get_gemini_client
 
 logger = get_logger(__name__)
 
+# Espera de rate limiting entre requisições (nome do módulo, substituível em testes)
+sleep = asyncio.sleep
+
 class NewsSearchTool(BaseTool):
     """
     Ferramenta para busca e análise de notícias relacionadas a SRAG.
@@ -251,7 +254,7 @@ class NewsSearchTool(BaseTool):
                     articles.append(article)
                 
                 # Rate limiting
-                await asyncio.sleep(1)
+                await sleep(1)
                 
             except Exception as e:
                 logger.error(f"Erro ao processar RSS {rss_url}: {e}", exc_info=True)
@@ -323,7 +326,7 @@ class NewsSearchTool(BaseTool):
                         else:
                             logger.warning(f"News API retornou status {response.status}")
                 
-                await asyncio.sleep(0.5)
+                await sleep(0.5)
             
             # Se nenhum artigo foi encontrado, usar fallback
             if not articles:
@@ -25,6 +25,7 @@ class Config:
             'GEMINI_MODEL': os.getenv('GEMINI_MODEL', 'gemini-2.5-flash'),
             'GEMINI_TEMPERATURE': float(os.getenv('GEMINI_TEMPERATURE', '0.7')),
             'GEMINI_MAX_TOKENS': int(os.getenv('GEMINI_MAX_TOKENS', '2048')),
+            'GEMINI_NEWS_TOKEN_BUDGET': int(os.getenv('GEMINI_NEWS_TOKEN_BUDGET', '2000')),
             
             # Logs
             'LOG_LEVEL': os.getenv('LOG_LEVEL', 'INFO'),
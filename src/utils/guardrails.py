@@ -4,11 +4,69 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Union
 import re
 import hashlib
+import orjson
+from functools import lru_cache
 
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Padrões de dados pessoais fundidos numa única alternação, compilada uma
+# vez na carga do módulo: o texto é percorrido uma só vez e o grupo
+# nomeado que casou define o substituto. Os lookbehinds só deixam CPF e
+# email começarem no início de uma sequência, mantendo a varredura linear
+# mesmo em texto hostil (ex.: 'a.a.a.a...' sem '@')
+_SENSITIVE_RE = re.compile(
+    r'(?P<cpf>(?<!\d)\d{3}\.\d{3}\.\d{3}-\d{2})'  # XXX.XXX.XXX-XX
+    r'|(?P<tel>\(\d{2}\)\s?\d{4,5}-?\d{4})'
+    r'|(?P<email>(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+)
+_SENSITIVE_REPLACEMENTS = {
+    'cpf': '[CPF removido]',
+    'tel': '[telefone removido]',
+    'email': '[email removido]'
+}
+
+# Lista branca do formato de data: entradas que não sejam exatamente
+# YYYY-MM-DD (injeção de SQL, scripts, caminhos) são rejeitadas antes do parse
+_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+# Assinatura: JSON canônico (chaves ordenadas) + BLAKE2b personalizado com a
+# versão dos guardrails, para que assinaturas de versões diferentes não colidam
+_SIGNATURE_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+)
+_SIGNATURE_PERSON = b'SRAG-guard-v1.0'
+
+# Limite de classificações de artigos memorizadas por instância
+ARTICLE_CACHE_SIZE = 2048
+
+# Fontes de notícias consideradas confiáveis (lista básica)
+RELIABLE_NEWS_SOURCES = (
+    'g1.com', 'folha.uol.com.br', 'estadao.com.br',
+    'bbc.com', 'gov.br', 'saude.gov.br',
+    'fiocruz.br', 'butantan.gov.br'
+)
+
+# Termos suspeitos aplicados a fontes não confiáveis
+_SUSPICIOUS_RE = re.compile(r'milagre|cura definitiva|100% eficaz', re.IGNORECASE)
+
+@lru_cache(maxsize=8)
+def _compile_terms(terms: tuple) -> re.Pattern:
+    """
+    Compila uma lista de termos numa alternação literal, sem diferenciar caixa.
+    
+    Memorizado por conjunto de termos: instâncias criadas com a mesma lista
+    (o caso comum) compartilham o padrão compilado na primeira construção.
+    
+    Args:
+        terms: Termos a procurar
+        
+    Returns:
+        Padrão compilado
+    """
+    return re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+
 class SRAGGuardrails:
     """
     Sistema de proteção e validação para dados SRAG.
@@ -33,7 +91,11 @@ class SRAGGuardrails:
             'NM_PACIENT',  # Nome do paciente (se existir)
             'CPF',         # CPF (se existir)
             'IDENTIDADE',  # RG (se existir)
+            'NU_TEL',      # Telefone (se existir)
+            'CO_CARTAO_CNS',  # Cartão Nacional de Saúde (se existir)
         ]
+        # Conjunto para interseção direta com as colunas do DataFrame
+        self._sensitive_set = frozenset(self.sensitive_columns)
         
         # Limites para métricas (valores suspeitos)
         self.metric_limits = {
@@ -49,6 +111,13 @@ class SRAGGuardrails:
             'anti-vacina', 'desinformação', 'hoax'
         ]
         
+        # Todos os termos proibidos numa única alternação: uma varredura do
+        # texto em C em vez de um laço de buscas em Python
+        self._prohibited_re = _compile_terms(tuple(self.prohibited_news_terms))
+        
+        # Classificações de artigos já avaliados (hash do conteúdo -> bool)
+        self.article_cache = {}
+        
         logger.info("Sistema de Guardrails inicializado")
     
     def validate_request(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -294,8 +363,13 @@ class SRAGGuardrails:
         Raises:
             ValueError: Se formato inválido
         """
+        if not isinstance(date_string, str) or not _DATE_RE.fullmatch(date_string):
+            raise ValueError(f"Formato de data inválido: {date_string}. Use YYYY-MM-DD")
+        
+        # Formato já garantido pela lista branca: fromisoformat (em C) só
+        # precisa checar mês/dia, bem mais barato que strptime
         try:
-            datetime.strptime(date_string, "%Y-%m-%d")
+            datetime.fromisoformat(date_string)
         except ValueError:
             raise ValueError(f"Formato de data inválido: {date_string}. Use YYYY-MM-DD")
     
@@ -309,15 +383,16 @@ class SRAGGuardrails:
         Raises:
             ValueError: Se data fora da faixa
         """
-        date_obj = datetime.strptime(date_string, "%Y-%m-%d")
+        date_obj = datetime.fromisoformat(date_string)
+        now = datetime.now()
         
         # Data não pode ser muito antiga (máximo 3 anos)
-        min_date = datetime.now() - timedelta(days=1095)
+        min_date = now - timedelta(days=1095)
         if date_obj < min_date:
             raise ValueError(f"Data muito antiga: {date_string}")
         
         # Data não pode ser futura
-        if date_obj > datetime.now():
+        if date_obj > now:
             raise ValueError(f"Data futura não permitida: {date_string}")
     
     def _anonymize_personal_data(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -331,20 +406,24 @@ class SRAGGuardrails:
             DataFrame anonimizado
         """
         try:
-            anonymized_data = data.copy()
-            
-            # Remover colunas completamente sensíveis
-            columns_to_remove = [col for col in self.sensitive_columns 
-                               if col in anonymized_data.columns]
-            
-            if columns_to_remove:
-                anonymized_data = anonymized_data.drop(columns=columns_to_remove)
-                logger.info(f"Removidas {len(columns_to_remove)} colunas sensíveis")
+            # Remover colunas completamente sensíveis (máscara vetorizada sobre
+            # o índice de colunas, preservando ordem e nomes duplicados)
+            remove_mask = data.columns.isin(self._sensitive_set)
+            removed_count = int(remove_mask.sum())
+            if removed_count:
+                logger.info(f"Removidas {removed_count} colunas sensíveis")
             
             # Generalizar municípios para apenas UF
-            if 'CO_MUN_NOT' in anonymized_data.columns and 'SG_UF_NOT' in anonymized_data.columns:
+            if 'CO_MUN_NOT' in data.columns and 'SG_UF_NOT' in data.columns:
                 # Manter apenas UF, remover identificação específica do município
-                anonymized_data = anonymized_data.drop(columns=['CO_MUN_NOT'], errors='ignore')
+                remove_mask |= data.columns == 'CO_MUN_NOT'
+            
+            # Uma única seleção (que já devolve um novo DataFrame) em vez de
+            # copiar e depois descartar colunas
+            if remove_mask.any():
+                anonymized_data = data.loc[:, ~remove_mask]
+            else:
+                anonymized_data = data.copy()
             
             # Generalizar idades para faixas etárias
             if 'NU_IDADE_N' in anonymized_data.columns:
@@ -500,6 +579,42 @@ class SRAGGuardrails:
         """
         Verifica se artigo é apropriado para inclusão.
         
+        O mesmo artigo passa por várias etapas do pipeline, então o resultado
+        fica memorizado pelo hash de título, conteúdo e fonte.
+        
+        Args:
+            article: Dict com dados do artigo
+            
+        Returns:
+            bool: True se apropriado
+        """
+        try:
+            cache_key = hashlib.blake2b(
+                '\x1f'.join((
+                    article.get('title', ''),
+                    article.get('content', ''),
+                    article.get('source', '')
+                )).encode(),
+                digest_size=8
+            ).digest()
+            
+            appropriate = self.article_cache.get(cache_key)
+            if appropriate is None:
+                appropriate = self._classify_article(article)
+                if len(self.article_cache) >= ARTICLE_CACHE_SIZE:
+                    self.article_cache.clear()
+                self.article_cache[cache_key] = appropriate
+            
+            return appropriate
+            
+        except Exception as e:
+            logger.warning(f"Erro na validação de artigo: {e}")
+            return False
+    
+    def _classify_article(self, article: Dict[str, Any]) -> bool:
+        """
+        Classifica artigo quanto a termos proibidos e confiabilidade da fonte.
+        
         Args:
             article: Dict com dados do artigo
             
@@ -510,35 +625,23 @@ class SRAGGuardrails:
             # Verificar título e conteúdo
             text_to_check = ""
             if 'title' in article:
-                text_to_check += article['title'].lower()
+                text_to_check += article['title']
             if 'content' in article:
-                text_to_check += " " + article['content'].lower()
+                text_to_check += " " + article['content']
             
             # Procurar termos proibidos
-            for term in self.prohibited_news_terms:
-                if term in text_to_check:
-                    return False
-            
-            # Verificar se é de fonte confiável (lista básica)
-            reliable_sources = [
-                'g1.com', 'folha.uol.com.br', 'estadao.com.br', 
-                'bbc.com', 'gov.br', 'saude.gov.br',
-                'fiocruz.br', 'butantan.gov.br'
-            ]
+            if self._prohibited_re.search(text_to_check):
+                return False
             
+            # Verificar se é de fonte confiável
             if 'source' in article:
                 source = article['source'].lower()
-                if any(reliable in source for reliable in reliable_sources):
+                if any(reliable in source for reliable in RELIABLE_NEWS_SOURCES):
                     return True
             
             # Se não tem fonte identificada ou não é claramente confiável,
             # aplicar filtros mais rigorosos
-            suspicious_terms = ['milagre', 'cura definitiva', '100% eficaz']
-            for term in suspicious_terms:
-                if term in text_to_check:
-                    return False
-            
-            return True
+            return _SUSPICIOUS_RE.search(text_to_check) is None
             
         except Exception as e:
             logger.warning(f"Erro na validação de artigo: {e}")
@@ -555,19 +658,8 @@ class SRAGGuardrails:
             Texto filtrado
         """
         try:
-            filtered_text = text
-            
-            # Remover menções a termos proibidos
-            for term in self.prohibited_news_terms:
-                # Substituir por termo neutro
-                filtered_text = re.sub(
-                    re.escape(term), 
-                    '[conteúdo filtrado]', 
-                    filtered_text, 
-                    flags=re.IGNORECASE
-                )
-            
-            return filtered_text
+            # Substituir menções a termos proibidos por termo neutro
+            return self._prohibited_re.sub('[conteúdo filtrado]', text)
             
         except Exception as e:
             logger.error(f"Erro no filtro de texto: {e}")
@@ -629,21 +721,9 @@ class SRAGGuardrails:
             Texto anonimizado
         """
         try:
-            anonymized_text = text
-            
-            # Padrão de CPF (XXX.XXX.XXX-XX)
-            cpf_pattern = r'\d{3}\.\d{3}\.\d{3}-\d{2}'
-            anonymized_text = re.sub(cpf_pattern, '[CPF removido]', anonymized_text)
-            
-            # Padrão de telefone
-            phone_pattern = r'\(\d{2}\)\s?\d{4,5}-?\d{4}'
-            anonymized_text = re.sub(phone_pattern, '[telefone removido]', anonymized_text)
-            
-            # Padrão de email
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            anonymized_text = re.sub(email_pattern, '[email removido]', anonymized_text)
-            
-            return anonymized_text
+            return _SENSITIVE_RE.sub(
+                lambda match: _SENSITIVE_REPLACEMENTS[match.lastgroup], text
+            )
             
         except Exception as e:
             logger.error(f"Erro na anonimização de padrões: {e}")
@@ -660,16 +740,18 @@ class SRAGGuardrails:
             String com assinatura hash
         """
         try:
-            # Criar string para hash baseada em elementos-chave
-            signature_data = {
-                'report_date': report.get('metadata', {}).get('report_date'),
-                'metrics_count': len(report.get('metrics', {})),
-                'validation_timestamp': datetime.now().isoformat(),
-                'guardrails_version': '1.0'
-            }
-            
-            signature_string = str(signature_data)
-            signature_hash = hashlib.sha256(signature_string.encode()).hexdigest()[:16]
+            # Uma assinatura anterior não entra no hash; só copia o dict
+            # quando ela existe (o caso comum é um relatório ainda sem assinatura)
+            if 'guardrails_signature' in report:
+                report = {key: value for key, value in report.items()
+                          if key != 'guardrails_signature'}
+            
+            # Relatórios equivalentes geram o mesmo payload, independentemente da
+            # ordem das chaves (o encoder em C evita montar estruturas em Python)
+            payload = orjson.dumps(report, default=str, option=_SIGNATURE_OPTIONS)
+            signature_hash = hashlib.blake2b(
+                payload, digest_size=12, person=_SIGNATURE_PERSON
+            ).hexdigest()
             
             return f"SRAG-{signature_hash}"
             
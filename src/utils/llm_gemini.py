@@ -6,9 +6,12 @@ import warnings
 # Suppress the FutureWarning about deprecated google.generativeai package
 warnings.filterwarnings('ignore', category=FutureWarning, module='google.generativeai')
 
-import google.generativeai as genai
 from typing import Optional, Dict, Any, List
 import asyncio
+import random
+import re
+import threading
+import time
 from functools import lru_cache
 
 from .config import Config
@@ -16,6 +19,36 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Métricas incluídas no contexto dos prompts, na ordem de exibição
+METRIC_NAMES = (
+    ('case_increase_rate', 'Taxa de Aumento de Casos'),
+    ('mortality_rate', 'Taxa de Mortalidade'),
+    ('icu_occupancy_rate', 'Taxa de Ocupação de UTI'),
+    ('vaccination_rate', 'Taxa de Vacinação'),
+)
+
+# Estimativa de caracteres por token usada para o orçamento dos prompts
+CHARS_PER_TOKEN = 4
+
+# Similaridade (Jaccard) entre títulos a partir da qual artigos são duplicados
+NEWS_DEDUP_THRESHOLD = 0.8
+
+# Retry com backoff exponencial para erros transitórios da API
+RETRY_BASE_DELAY = 1.0  # segundos
+RETRY_MAX_DELAY = 10.0
+
+# Circuit breaker: após N falhas consecutivas, chamadas vão direto ao fallback
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30.0
+
+# Padrão único com grupos nomeados por tema, usado na análise fallback
+_THEME_PATTERN = re.compile(
+    r'(?P<increase>aumento|alta|crescimento)'
+    r'|(?P<deaths>óbito|morte)'
+    r'|(?P<hospitalization>uti|internação|hospital)'
+    r'|(?P<vaccination>vacina)'
+)
+
 
 class GeminiLLM:
     """
@@ -34,12 +67,33 @@ class GeminiLLM:
         self.model_name = self.config.get('GEMINI_MODEL', 'gemini-2.5-flash')
         self.temperature = self.config.get('GEMINI_TEMPERATURE', 0.7)
         self.max_tokens = self.config.get('GEMINI_MAX_TOKENS', 2048)
+        self.news_token_budget = self.config.get('GEMINI_NEWS_TOKEN_BUDGET', 2000)
+        self.max_retry_attempts = max(1, self.config.get('MAX_RETRY_ATTEMPTS', 3))
+        
+        # Estado do circuit breaker (compartilhado entre threads)
+        self._breaker = {'fails': 0, 'opened_at': 0.0}
+        self._breaker_lock = threading.Lock()
+        
+        # SDK importado apenas quando há chave configurada: o modo fallback
+        # não paga o custo de importação (protobuf, grpc)
+        self._genai = None
+        self._retryable_errors: tuple = ()
         
         if not self.api_key:
             logger.warning("GEMINI_API_KEY não configurada. Modo fallback ativado.")
             self.model = None
         else:
             try:
+                import google.generativeai as genai
+                from google.api_core import exceptions as api_exceptions
+                self._genai = genai
+                self._retryable_errors = (
+                    api_exceptions.ResourceExhausted,
+                    api_exceptions.ServiceUnavailable,
+                    api_exceptions.InternalServerError,
+                    api_exceptions.DeadlineExceeded,
+                )
+                
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel(self.model_name)
                 logger.info(f"Gemini LLM inicializado com modelo: {self.model_name}")
@@ -87,12 +141,7 @@ Por favor, forneça:
 Mantenha a análise objetiva e baseada nos dados apresentados.
 """
             
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                self._generate_with_timeout, 
-                prompt
-            )
+            response = await asyncio.to_thread(self._generate_with_timeout, prompt)
             
             logger.info("Análise de notícias gerada com sucesso via Gemini")
             return response
@@ -147,12 +196,7 @@ Exemplo:
 }}
 """
             
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                self._generate_with_timeout, 
-                prompt
-            )
+            response = await asyncio.to_thread(self._generate_with_timeout, prompt)
             
             # Tentar parsear como JSON
             import json
@@ -216,12 +260,7 @@ Por favor, forneça:
 Mantenha o texto conciso e profissional, adequado para relatório executivo.
 """
             
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                self._generate_with_timeout, 
-                prompt
-            )
+            response = await asyncio.to_thread(self._generate_with_timeout, prompt)
             
             logger.info("Insights de relatório gerados com sucesso via Gemini")
             return response
@@ -230,6 +269,13 @@ Mantenha o texto conciso e profissional, adequado para relatório executivo.
             logger.error(f"Erro ao gerar insights: {e}")
             return "Insights não disponíveis neste momento."
     
+    def _generation_config(self) -> Any:
+        """Monta configuração de geração a partir das configurações do cliente."""
+        return self._genai.types.GenerationConfig(
+            temperature=self.temperature,
+            max_output_tokens=self.max_tokens,
+        )
+    
     def _generate_with_timeout(self, prompt: str) -> str:
         """
         Gera resposta com timeout.
@@ -244,15 +290,32 @@ Mantenha o texto conciso e profissional, adequado para relatório executivo.
             if not self.model:
                 raise RuntimeError("Modelo Gemini não inicializado")
             
-            generation_config = genai.types.GenerationConfig(
-                temperature=self.temperature,
-                max_output_tokens=self.max_tokens,
-            )
+            self._check_breaker()
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
+            attempt = 1
+            while True:
+                try:
+                    response = self.model.generate_content(
+                        prompt,
+                        generation_config=self._generation_config()
+                    )
+                    break
+                except self._retryable_errors as e:
+                    if attempt >= self.max_retry_attempts:
+                        self._record_failure()
+                        raise
+                    delay = self._retry_delay(attempt)
+                    logger.warning(
+                        f"Erro transitório do Gemini (tentativa {attempt}/"
+                        f"{self.max_retry_attempts}), nova tentativa em {delay:.1f}s: {e}"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+                except Exception:
+                    self._record_failure()
+                    raise
+            
+            self._record_success()
             
             if response.text:
                 return response.text
@@ -264,50 +327,107 @@ Mantenha o texto conciso e profissional, adequado para relatório executivo.
             logger.error(f"Erro na geração com Gemini: {e}")
             raise
     
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Backoff exponencial com jitter para a tentativa informada."""
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        return delay + random.uniform(0, RETRY_BASE_DELAY)
+    
+    def _check_breaker(self) -> None:
+        """
+        Falha imediatamente se o circuit breaker estiver aberto.
+        
+        Raises:
+            RuntimeError: Se houve falhas consecutivas demais na janela recente
+        """
+        with self._breaker_lock:
+            if (self._breaker['fails'] >= BREAKER_FAILURE_THRESHOLD and
+                    time.monotonic() - self._breaker['opened_at'] < BREAKER_RESET_SECONDS):
+                raise RuntimeError(
+                    "Circuit breaker do Gemini aberto após falhas consecutivas"
+                )
+    
+    def _record_failure(self) -> None:
+        """Registra falha e abre o circuit breaker ao atingir o limite."""
+        with self._breaker_lock:
+            self._breaker['fails'] += 1
+            if self._breaker['fails'] >= BREAKER_FAILURE_THRESHOLD:
+                self._breaker['opened_at'] = time.monotonic()
+                logger.warning(
+                    f"Circuit breaker do Gemini aberto por {BREAKER_RESET_SECONDS:.0f}s "
+                    f"({self._breaker['fails']} falhas consecutivas)"
+                )
+    
+    def _record_success(self) -> None:
+        """Fecha o circuit breaker após uma chamada bem-sucedida."""
+        with self._breaker_lock:
+            self._breaker['fails'] = 0
+    
     def _prepare_news_context(self, articles: List[Dict[str, Any]]) -> str:
         """Prepara contexto das notícias para o prompt."""
         if not articles:
             return "Nenhuma notícia disponível."
         
         context_parts = []
-        for i, article in enumerate(articles[:10], 1):  # Limitar a 10 notícias
-            title = article.get('title', 'Sem título')
-            source = article.get('source', 'Fonte desconhecida')
-            summary = article.get('summary', 'Sem resumo')[:200]
-            published = article.get('published', 'Data desconhecida')
+        seen_titles: List[frozenset] = []
+        used_tokens = 0
+        duplicates = 0
+        
+        for article in articles:
+            if len(context_parts) >= 10:  # Limitar a 10 notícias
+                break
+            
+            # Ignorar artigos com título quase idêntico a um já incluído
+            shingles = _title_shingles(article.get('title', ''))
+            if any(_jaccard(shingles, seen) >= NEWS_DEDUP_THRESHOLD for seen in seen_titles):
+                duplicates += 1
+                continue
+            
+            item = self._format_news_item(len(context_parts) + 1, article)
+            item_tokens = _estimate_tokens(item)
             
-            context_parts.append(
-                f"{i}. [{source}] {title}\n"
-                f"   Data: {published}\n"
-                f"   Resumo: {summary}\n"
+            # Respeitar orçamento de tokens (sempre incluir ao menos um artigo)
+            if context_parts and used_tokens + item_tokens > self.news_token_budget:
+                break
+            
+            context_parts.append(item)
+            seen_titles.append(shingles)
+            used_tokens += item_tokens
+        
+        trimmed = len(articles) - len(context_parts)
+        if trimmed:
+            logger.info(
+                f"Contexto de notícias reduzido: {len(context_parts)}/{len(articles)} artigos "
+                f"(~{used_tokens} tokens, {duplicates} duplicados)"
             )
         
         return "\n".join(context_parts)
     
+    @staticmethod
+    def _format_news_item(index: int, article: Dict[str, Any]) -> str:
+        """Formata um artigo para o contexto do prompt."""
+        summary = article.get('summary', 'Sem resumo')
+        if len(summary) > 200:
+            summary = summary[:200]
+        
+        return (
+            f"{index}. [{article.get('source', 'Fonte desconhecida')}] "
+            f"{article.get('title', 'Sem título')}\n"
+            f"   Data: {article.get('published', 'Data desconhecida')}\n"
+            f"   Resumo: {summary}\n"
+        )
+    
     def _prepare_metrics_context(self, metrics: Dict[str, Any]) -> str:
         """Prepara contexto das métricas para o prompt."""
-        context_parts = []
-        
-        metric_names = {
-            'case_increase_rate': 'Taxa de Aumento de Casos',
-            'mortality_rate': 'Taxa de Mortalidade',
-            'icu_occupancy_rate': 'Taxa de Ocupação de UTI',
-            'vaccination_rate': 'Taxa de Vacinação'
-        }
-        
-        for key, name in metric_names.items():
-            if key in metrics and isinstance(metrics[key], dict):
-                rate = metrics[key].get('rate', 'N/A')
-                interpretation = metrics[key].get('interpretation', '')
-                period_days = metrics[key].get('period_days', 'N/A')
-                
-                context_parts.append(
-                    f"- {name}: {rate}%\n"
-                    f"  Interpretação: {interpretation}\n"
-                    f"  Período: {period_days} dias\n"
-                )
+        context = "\n".join(
+            f"- {name}: {metric.get('rate', 'N/A')}%\n"
+            f"  Interpretação: {metric.get('interpretation', '')}\n"
+            f"  Período: {metric.get('period_days', 'N/A')} dias\n"
+            for key, name in METRIC_NAMES
+            if isinstance(metric := metrics.get(key), dict)
+        )
         
-        return "\n".join(context_parts) if context_parts else "Nenhuma métrica disponível."
+        return context or "Nenhuma métrica disponível."
     
     def _generate_fallback_analysis(
         self, 
@@ -329,18 +449,11 @@ Mantenha o texto conciso e profissional, adequado para relatório executivo.
         themes = {'increase': 0, 'deaths': 0, 'hospitalization': 0, 'vaccination': 0}
         
         for article in articles:
-            title = article.get('title', '').lower()
-            summary = article.get('summary', '').lower()
-            content = f"{title} {summary}"
+            content = f"{article.get('title', '')} {article.get('summary', '')}".lower()
             
-            if any(word in content for word in ['aumento', 'alta', 'crescimento']):
-                themes['increase'] += 1
-            if any(word in content for word in ['óbito', 'morte']):
-                themes['deaths'] += 1
-            if any(word in content for word in ['uti', 'internação', 'hospital']):
-                themes['hospitalization'] += 1
-            if any(word in content for word in ['vacina', 'vacinação']):
-                themes['vaccination'] += 1
+            # Uma única varredura por artigo; cada tema conta no máximo uma vez
+            for theme in {match.lastgroup for match in _THEME_PATTERN.finditer(content)}:
+                themes[theme] += 1
         
         analysis_parts.append(
             f"\nTemas identificados nas notícias:\n"
@@ -418,18 +531,42 @@ Mantenha o texto conciso e profissional, adequado para relatório executivo.
         return explanations
 
 
+def _estimate_tokens(text: str) -> int:
+    """Estima número de tokens de um texto (aprox. 4 caracteres por token)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _title_shingles(title: str) -> frozenset:
+    """Conjunto de trigramas de caracteres do título normalizado."""
+    normalized = " ".join(title.lower().split())
+    return frozenset(normalized[i:i + 3] for i in range(len(normalized) - 2))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    """Similaridade de Jaccard entre dois conjuntos (0.0 se algum for vazio)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
 # Instância global do cliente Gemini
 _gemini_client: Optional[GeminiLLM] = None
+_gemini_lock = threading.Lock()
 
 
 def get_gemini_client() -> GeminiLLM:
     """
     Obtém instância singleton do cliente Gemini.
     
+    Usa double-checked locking para que chamadas concorrentes durante a
+    inicialização não criem mais de uma instância.
+    
     Returns:
         Instância de GeminiLLM
     """
     global _gemini_client
     if _gemini_client is None:
-        _gemini_client = GeminiLLM()
+        with _gemini_lock:
+            if _gemini_client is None:
+                _gemini_client = GeminiLLM()
     return _gemini_client
@@ -3,11 +3,131 @@ Sistema de logging estruturado e legível para o Sistema SRAG
 """
 
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import orjson
 import structlog
 from datetime import datetime
+import atexit
+import gzip
 import os
+import queue
+import shutil
+import time
 from pathlib import Path
-import json
+from typing import Optional
+
+# Rotação do arquivo de log principal
+LOG_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+LOG_BACKUP_COUNT = 10
+
+# Buffer de escrita do arquivo de log principal (flush só em WARNING+)
+LOG_BUFFER_SIZE = 64 * 1024  # 64 KiB
+
+# Listener que drena a fila de logs para os handlers (um por processo)
+_listener: Optional[QueueListener] = None
+
+# Indica se logging/structlog já foram configurados neste processo
+_CONFIGURED = False
+
+# Parte "%Y-%m-%dT%H:%M:%S" do timestamp, por segundo (no máximo 2 entradas)
+_TS_CACHE = {}
+
+
+def _gzip_namer(name: str) -> str:
+    """Nomeia arquivos rotacionados com extensão .gz"""
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Comprime o arquivo de log rotacionado e remove o original"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def add_timestamp(logger, method_name, event_dict):
+    """
+    Adiciona timestamp ISO 8601 em UTC (mesmo formato do TimeStamper(fmt="iso")).
+    
+    A parte de data/hora é formatada uma vez por segundo e reaproveitada;
+    por registro só os microssegundos são calculados.
+    """
+    now = time.time()
+    sec = int(now)
+    cached = _TS_CACHE.get(sec)
+    if cached is None:
+        if len(_TS_CACHE) >= 2:
+            _TS_CACHE.clear()
+        cached = _TS_CACHE[sec] = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+    event_dict["timestamp"] = f"{cached}.{int((now - sec) * 1e6):06d}Z"
+    return event_dict
+
+
+def format_exc_info_if_present(logger, method_name, event_dict):
+    """Formata a exceção só quando o evento traz exc_info (caso raro)"""
+    if "exc_info" in event_dict:
+        return structlog.processors.format_exc_info(logger, method_name, event_dict)
+    return event_dict
+
+
+class PassthroughQueueHandler(QueueHandler):
+    """
+    QueueHandler que enfileira o LogRecord intacto.
+    
+    O `prepare` padrão formata a mensagem como string, o que descartaria o
+    event dict do structlog antes dos ProcessorFormatter dos handlers finais.
+    Como a fila é em memória (sem pickle), o registro pode seguir como está.
+    """
+    
+    def prepare(self, record):
+        return record
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler com buffer de escrita grande.
+    
+    O arquivo é aberto com buffer de `buffer_size` bytes e o flush só acontece
+    para registros a partir de `flush_level` (e ao rotacionar/fechar), em vez
+    de uma syscall por linha. O tamanho do arquivo é acompanhado em memória,
+    pois consultar `stream.tell()` para decidir a rotação forçaria o flush.
+    """
+    
+    def __init__(self, *args, buffer_size: int = LOG_BUFFER_SIZE,
+                 flush_level: int = logging.WARNING, **kwargs):
+        # Definidos antes do super(), que já abre o arquivo via _open
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self._size = 0
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=self.errors)
+        self._size = stream.tell()
+        return stream
+    
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            
+            # maxBytes é em bytes: texto não-ASCII ocupa mais de 1 byte por caractere
+            msg_size = len(msg.encode(self.encoding or 'utf-8'))
+            if self.maxBytes > 0 and self._size + msg_size >= self.maxBytes:
+                self.doRollover()
+            
+            self.stream.write(msg)
+            self._size += msg_size
+            
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
 
 class ColorFormatter(logging.Formatter):
     """Formatter com cores e layout limpo para melhor legibilidade"""
@@ -177,14 +297,16 @@ class StructuredConsoleRenderer:
 
 
 class JSONFileRenderer:
-    """Renderiza logs como JSON para arquivo"""
+    """Renderiza logs como JSON para arquivo (serialização via orjson)"""
+    
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
     
     def __call__(self, logger, method_name, event_dict):
         """Renderiza como JSON compacto"""
-        return json.dumps(event_dict, default=str, ensure_ascii=False)
+        return orjson.dumps(event_dict, default=str, option=self.OPTIONS).decode()
 
 
-def setup_logger(name: str) -> structlog.stdlib.BoundLogger:
+def setup_logger(name: str) -> structlog.typing.FilteringBoundLogger:
     """
     Configura logger estruturado com output legível e organizado.
     
@@ -194,10 +316,30 @@ def setup_logger(name: str) -> structlog.stdlib.BoundLogger:
     Returns:
         Logger configurado
     """
-    # Criar diretório de logs se não existir
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True, parents=True)
+    global _CONFIGURED
+    
+    # Configuração acontece uma única vez; chamadas seguintes só obtêm o logger
+    if not _CONFIGURED:
+        # Criar diretório de logs (uma vez) antes de abrir os arquivos
+        log_dir = Path("logs")
+        log_dir.mkdir(parents=True, exist_ok=True)
+        
+        _configure_logging(log_dir)
+        
+        # Drenar a fila no encerramento do processo (registrado uma única vez)
+        atexit.register(_stop_queue_listener)
+        _CONFIGURED = True
     
+    return structlog.get_logger(name)
+
+
+def _configure_logging(log_dir: Path) -> None:
+    """
+    Configura logging padrão e structlog para o processo.
+    
+    Args:
+        log_dir: Diretório dos arquivos de log
+    """
     # Obter configuração do ambiente
     log_level_str = os.getenv('LOG_LEVEL', 'INFO').upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
@@ -206,29 +348,7 @@ def setup_logger(name: str) -> structlog.stdlib.BoundLogger:
     python_logger = logging.getLogger()
     python_logger.setLevel(log_level)
     
-    # Remover handlers antigos
-    for handler in python_logger.handlers[:]:
-        python_logger.removeHandler(handler)
-    
-    # Handler para console (colorido e legível)
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(ColorFormatter())
-    console_handler.setLevel(log_level)
-    python_logger.addHandler(console_handler)
-    
-    # Handler para arquivo (JSON estruturado)
-    file_handler = logging.FileHandler(log_dir / "srag_system.log", encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter(
-        '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "message": "%(message)s"}'
-    ))
-    file_handler.setLevel(logging.DEBUG)  # Sempre DEBUG no arquivo
-    python_logger.addHandler(file_handler)
-    
-    # Handler para erros separado
-    error_handler = logging.FileHandler(log_dir / "srag_errors.log", encoding='utf-8')
-    error_handler.setFormatter(ColorFormatter())
-    error_handler.setLevel(logging.ERROR)
-    python_logger.addHandler(error_handler)
+    _start_queue_listener(python_logger, log_dir, log_level)
     
     # Silenciar loggers verbosos de bibliotecas
     logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -239,39 +359,96 @@ def setup_logger(name: str) -> structlog.stdlib.BoundLogger:
     # Configurar structlog
     structlog.configure(
         processors=[
-            structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
+            add_timestamp,
+            format_exc_info_if_present,
             structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Chamadas abaixo do nível configurado viram no-op, sem passar
+        # pelos processors nem pelo despacho dinâmico de nível do stdlib
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         cache_logger_on_first_use=True,
     )
+
+
+def _start_queue_listener(python_logger: logging.Logger, log_dir: Path, log_level: int) -> None:
+    """
+    Liga o logger raiz a uma fila em memória drenada por uma thread dedicada.
+    
+    O código da aplicação só enfileira o registro; formatação e escrita em
+    console/arquivos acontecem no QueueListener, fora do caminho crítico.
+    
+    Args:
+        python_logger: Logger raiz
+        log_dir: Diretório dos arquivos de log
+        log_level: Nível mínimo para o console
+    """
+    global _listener
     
-    # Configurar formatters diferentes para console e arquivo
+    # Reconfiguração: encerrar o listener anterior antes de trocar os handlers
+    _stop_queue_listener()
+    
+    # Remover handlers antigos
+    for handler in python_logger.handlers[:]:
+        python_logger.removeHandler(handler)
+    
+    # Handler para console (colorido e legível)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(log_level)
     console_handler.setFormatter(
         structlog.stdlib.ProcessorFormatter(
             processor=StructuredConsoleRenderer(),
         )
     )
     
+    # Handler para arquivo (JSON estruturado), rotacionado, comprimido e bufferizado
+    file_handler = BufferedRotatingFileHandler(
+        log_dir / "srag_system.log",
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    file_handler.setLevel(logging.DEBUG)  # Sempre DEBUG no arquivo
     file_handler.setFormatter(
         structlog.stdlib.ProcessorFormatter(
             processor=JSONFileRenderer(),
         )
     )
     
-    return structlog.get_logger(name)
+    # Handler para erros separado
+    error_handler = logging.FileHandler(log_dir / "srag_errors.log", encoding='utf-8')
+    error_handler.setFormatter(ColorFormatter())
+    error_handler.setLevel(logging.ERROR)
+    
+    # Logger raiz apenas enfileira; o listener distribui para os handlers
+    log_queue = queue.Queue(-1)
+    python_logger.addHandler(PassthroughQueueHandler(log_queue))
+    
+    _listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
+
+
+def _stop_queue_listener() -> None:
+    """Drena a fila e encerra o listener atual, se houver."""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str) -> structlog.typing.FilteringBoundLogger:
     """
     Obtém logger para o componente especificado.
     
@@ -7,6 +7,7 @@ do sistema de relatórios automatizados baseado em IA Generativa.
 
 """
 
+import importlib.util
 import sys
 import os
 from pathlib import Path
@@ -75,25 +76,7 @@ def cleanup_test_files():
         if temp_dir.exists():
             shutil.rmtree(temp_dir)
 
-# Configuração de pytest programática (backup do pytest.ini)
-def pytest_configure(config):
-    """Configuração programática do pytest."""
-    config.addinivalue_line(
-        "markers", 
-        "slow: marks tests as slow (deselect with '-m \"not slow\"')"
-    )
-    config.addinivalue_line(
-        "markers",
-        "integration: marks tests as integration tests"
-    )
-    config.addinivalue_line(
-        "markers", 
-        "unit: marks tests as unit tests"
-    )
-    config.addinivalue_line(
-        "markers",
-        "performance: marks tests as performance tests"
-    )
+# Markers do pytest são registrados no pytest.ini
 
 def pytest_sessionfinish(session, exitstatus):
     """Cleanup após todas as sessões de teste."""
@@ -112,13 +95,10 @@ def validate_test_environment():
     if not SRC_DIR.exists():
         issues.append(f"Diretório src não encontrado: {SRC_DIR}")
     
-    # Verificar dependências críticas
-    try:
-        import pytest
-        import pandas
-        import numpy
-    except ImportError as e:
-        issues.append(f"Dependência faltando: {e}")
+    # Verificar dependências críticas (sem importá-las)
+    for module_name in ("pytest", "pandas", "numpy"):
+        if importlib.util.find_spec(module_name) is None:
+            issues.append(f"Dependência faltando: {module_name}")
     
     if issues:
         raise EnvironmentError(
@@ -1,6 +1,9 @@
 import pytest
+import copy
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime, timedelta
 from pathlib import Path
 import tempfile
@@ -10,87 +13,314 @@ import sys
 # Adicionar src ao path para imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-@pytest.fixture
-def sample_srag_data():
+# Schema do dataset grande de performance
+LARGE_DATASET_COLUMNS = [
+    'DT_NOTIFIC', 'SG_UF', 'NU_IDADE_N', 'CS_SEXO', 'UTI', 'EVOLUCAO', 'FEBRE', 'TOSSE'
+]
+UFS = np.array(['SP', 'RJ', 'MG', 'PR', 'RS'])
+SEX = np.array(['M', 'F'])
+YN = np.array(['1', '2'])
+EVO = np.array(['1', '2', '3'])
+
+@pytest.fixture(scope="session")
+def srag_data_session():
     """
-    Fixture que cria dados SRAG de exemplo para testes.
+    Fixture que cria dados SRAG de exemplo uma única vez por sessão.
+    
+    Não deve ser modificada pelos testes; use `sample_srag_data` para
+    obter uma cópia independente.
     
     Returns:
         DataFrame com dados de teste
     """
-    # Criar dados realistas de SRAG
+    # Criar dados realistas de SRAG (gerador com semente: dados determinísticos)
     n_records = 1000
+    rng = np.random.default_rng(42)
     
     # Gerar datas aleatórias nos últimos 2 anos
     start_date = datetime.now() - timedelta(days=730)
-    dates = [start_date + timedelta(days=np.random.randint(0, 730)) for _ in range(n_records)]
+    dates = start_date + pd.to_timedelta(rng.integers(0, 730, n_records), unit="D")
+    date_strs = dates.strftime('%d/%m/%Y')
     
     data = {
         'NU_NOTIFIC': [str(i) for i in range(n_records)],
-        'DT_NOTIFIC': [d.strftime('%d/%m/%Y') for d in dates],
-        'SG_UF_NOT': np.random.choice(['SP', 'RJ', 'MG', 'PR', 'RS'], n_records),
-        'CO_MUN_NOT': np.random.randint(100000, 999999, n_records),
-        'CS_SEXO': np.random.choice(['M', 'F', 'I'], n_records, p=[0.48, 0.50, 0.02]),
-        'NU_IDADE_N': np.random.gamma(2, 30, n_records).astype(int),  # Distribuição realista de idades
-        'DT_NASC': [d.strftime('%d/%m/%Y') for d in dates],
-        'UTI': np.random.choice(['1', '2', '9'], n_records, p=[0.25, 0.70, 0.05]),
-        'SUPORT_VEN': np.random.choice(['1', '2', '9'], n_records, p=[0.15, 0.80, 0.05]),
-        'HOSPITAL': np.random.choice(['1', '2', '9'], n_records, p=[0.20, 0.75, 0.05]),
-        'DT_INTERNA': [d.strftime('%d/%m/%Y') for d in dates],
-        'EVOLUCAO': np.random.choice(['1', '2', '3', '9'], n_records, p=[0.75, 0.15, 0.05, 0.05]),
-        'DT_EVOLUCA': [d.strftime('%d/%m/%Y') for d in dates],
-        'VACINA_COV': np.random.choice(['1', '2', '9'], n_records, p=[0.70, 0.25, 0.05]),
-        'DOSE_1_COV': np.random.choice(['1', '2', '9'], n_records, p=[0.85, 0.10, 0.05]),
-        'DOSE_2_COV': np.random.choice(['1', '2', '9'], n_records, p=[0.75, 0.20, 0.05]),
-        'DOSE_REF': np.random.choice(['1', '2', '9'], n_records, p=[0.60, 0.35, 0.05]),
-        'FEBRE': np.random.choice(['1', '2', '9'], n_records, p=[0.80, 0.15, 0.05]),
-        'TOSSE': np.random.choice(['1', '2', '9'], n_records, p=[0.75, 0.20, 0.05]),
-        'GARGANTA': np.random.choice(['1', '2', '9'], n_records, p=[0.40, 0.55, 0.05]),
-        'DISPNEIA': np.random.choice(['1', '2', '9'], n_records, p=[0.60, 0.35, 0.05]),
-        'DESC_RESP': np.random.choice(['1', '2', '9'], n_records, p=[0.55, 0.40, 0.05]),
-        'SATURACAO': np.random.choice(['1', '2', '9'], n_records, p=[0.45, 0.50, 0.05]),
-        'DIARREIA': np.random.choice(['1', '2', '9'], n_records, p=[0.30, 0.65, 0.05]),
-        'VOMITO': np.random.choice(['1', '2', '9'], n_records, p=[0.25, 0.70, 0.05]),
-        'DT_COLETA': [d.strftime('%d/%m/%Y') for d in dates],
-        'PCR_RESUL': np.random.choice(['1', '2', '9'], n_records, p=[0.20, 0.70, 0.10]),
-        'DT_PCR': [d.strftime('%d/%m/%Y') for d in dates],
-        'CLASSI_FIN': np.random.choice(['1', '2', '3', '4', '5'], n_records, p=[0.60, 0.10, 0.05, 0.15, 0.10]),
-        'CRITERIO': np.random.choice(['1', '2', '3', '9'], n_records, p=[0.50, 0.30, 0.15, 0.05]),
-        'DT_DIGITA': [d.strftime('%d/%m/%Y') for d in dates]
+        'DT_NOTIFIC': date_strs,
+        'SG_UF_NOT': rng.choice(['SP', 'RJ', 'MG', 'PR', 'RS'], n_records),
+        'CO_MUN_NOT': rng.integers(100000, 999999, n_records),
+        'CS_SEXO': rng.choice(['M', 'F', 'I'], n_records, p=[0.48, 0.50, 0.02]),
+        'NU_IDADE_N': rng.gamma(2, 30, n_records).astype(int),  # Distribuição realista de idades
+        'DT_NASC': date_strs,
+        'UTI': rng.choice(['1', '2', '9'], n_records, p=[0.25, 0.70, 0.05]),
+        'SUPORT_VEN': rng.choice(['1', '2', '9'], n_records, p=[0.15, 0.80, 0.05]),
+        'HOSPITAL': rng.choice(['1', '2', '9'], n_records, p=[0.20, 0.75, 0.05]),
+        'DT_INTERNA': date_strs,
+        'EVOLUCAO': rng.choice(['1', '2', '3', '9'], n_records, p=[0.75, 0.15, 0.05, 0.05]),
+        'DT_EVOLUCA': date_strs,
+        'VACINA_COV': rng.choice(['1', '2', '9'], n_records, p=[0.70, 0.25, 0.05]),
+        'DOSE_1_COV': rng.choice(['1', '2', '9'], n_records, p=[0.85, 0.10, 0.05]),
+        'DOSE_2_COV': rng.choice(['1', '2', '9'], n_records, p=[0.75, 0.20, 0.05]),
+        'DOSE_REF': rng.choice(['1', '2', '9'], n_records, p=[0.60, 0.35, 0.05]),
+        'FEBRE': rng.choice(['1', '2', '9'], n_records, p=[0.80, 0.15, 0.05]),
+        'TOSSE': rng.choice(['1', '2', '9'], n_records, p=[0.75, 0.20, 0.05]),
+        'GARGANTA': rng.choice(['1', '2', '9'], n_records, p=[0.40, 0.55, 0.05]),
+        'DISPNEIA': rng.choice(['1', '2', '9'], n_records, p=[0.60, 0.35, 0.05]),
+        'DESC_RESP': rng.choice(['1', '2', '9'], n_records, p=[0.55, 0.40, 0.05]),
+        'SATURACAO': rng.choice(['1', '2', '9'], n_records, p=[0.45, 0.50, 0.05]),
+        'DIARREIA': rng.choice(['1', '2', '9'], n_records, p=[0.30, 0.65, 0.05]),
+        'VOMITO': rng.choice(['1', '2', '9'], n_records, p=[0.25, 0.70, 0.05]),
+        'DT_COLETA': date_strs,
+        'PCR_RESUL': rng.choice(['1', '2', '9'], n_records, p=[0.20, 0.70, 0.10]),
+        'DT_PCR': date_strs,
+        'CLASSI_FIN': rng.choice(['1', '2', '3', '4', '5'], n_records, p=[0.60, 0.10, 0.05, 0.15, 0.10]),
+        'CRITERIO': rng.choice(['1', '2', '3', '9'], n_records, p=[0.50, 0.30, 0.15, 0.05]),
+        'DT_DIGITA': date_strs
     }
     
     df = pd.DataFrame(data)
     
     # Adicionar alguns dados problemáticos para testar validações
+    # (linhas distintas sorteadas uma vez e fatiadas por tipo de problema)
+    idx = rng.choice(n_records, 70, replace=False)
+    idade_col = df.columns.get_loc('NU_IDADE_N')
+    
     # Idades inválidas
-    df.loc[np.random.choice(df.index, 10), 'NU_IDADE_N'] = np.random.choice([-5, 150, 999])
+    df.iloc[idx[:10], idade_col] = rng.choice([-5, 150, 999], 10)
     
     # Valores categóricos inválidos
-    df.loc[np.random.choice(df.index, 5), 'CS_SEXO'] = 'X'
-    df.loc[np.random.choice(df.index, 5), 'EVOLUCAO'] = '5'
+    df.iloc[idx[10:15], df.columns.get_loc('CS_SEXO')] = 'X'
+    df.iloc[idx[15:20], df.columns.get_loc('EVOLUCAO')] = '5'
     
     # Alguns valores nulos
-    null_indices = np.random.choice(df.index, 50)
-    df.loc[null_indices, 'NU_IDADE_N'] = np.nan
+    df.iloc[idx[20:70], idade_col] = np.nan
     
     return df
 
 @pytest.fixture
-def sample_csv_file(sample_srag_data, tmp_path):
+def sample_srag_data(srag_data_session):
     """
-    Fixture que cria arquivo CSV temporário para testes.
+    Fixture que fornece uma cópia dos dados SRAG de exemplo.
     
     Args:
-        sample_srag_data: Dados de exemplo
-        tmp_path: Diretório temporário do pytest
+        srag_data_session: Dados gerados uma vez por sessão
+        
+    Returns:
+        DataFrame com dados de teste (pode ser modificado pelo teste)
+    """
+    return srag_data_session.copy()
+
+@pytest.fixture(scope="session")
+def sample_csv_file(srag_data_session, tmp_path_factory):
+    """
+    Fixture que cria arquivo CSV temporário, escrito uma vez por sessão.
+    
+    Os testes apenas leem o arquivo, então ele é compartilhado; quem
+    precisar alterá-lo deve trabalhar sobre uma cópia (shutil.copy).
+    A escrita é feita pelo writer CSV vetorizado do PyArrow; os dados são
+    ASCII, então o UTF-8 gerado é lido sem diferenças como latin-1.
+    
+    Args:
+        srag_data_session: Dados de exemplo
+        tmp_path_factory: Fábrica de diretórios temporários do pytest
         
     Returns:
         Path para arquivo CSV criado
     """
-    csv_file = tmp_path / "test_srag_data.csv"
-    sample_srag_data.to_csv(csv_file, index=False, sep=';', encoding='latin-1')
+    csv_file = tmp_path_factory.mktemp("csv") / "test_srag_data.csv"
+    pacsv.write_csv(
+        pa.Table.from_pandas(srag_data_session, preserve_index=False),
+        csv_file,
+        write_options=pacsv.WriteOptions(delimiter=';')
+    )
     return str(csv_file)
 
+def _with_fresh_stats(instance, stats_attr: str):
+    """
+    Cópia rasa de uma instância compartilhada com contadores próprios.
+    
+    Args:
+        instance: Instância criada uma vez por sessão
+        stats_attr: Nome do dict de estatísticas alterado pelos métodos
+        
+    Returns:
+        Cópia cujas estatísticas não vazam entre testes
+    """
+    fresh = copy.copy(instance)
+    setattr(fresh, stats_attr, dict(getattr(instance, stats_attr)))
+    return fresh
+
+@pytest.fixture(scope="session")
+def metrics_tool():
+    """Instância do MetricsCalculatorTool compartilhada pela sessão (sem estado mutável)."""
+    from src.tools.metrics_tool import MetricsCalculatorTool
+    return MetricsCalculatorTool()
+
+@pytest.fixture(scope="session")
+def guardrails():
+    """Instância do SRAGGuardrails compartilhada pela sessão (só caches internos)."""
+    from src.utils.guardrails import SRAGGuardrails
+    return SRAGGuardrails()
+
+@pytest.fixture(scope="session")
+def validator_session():
+    """Instância do SRAGDataValidator criada uma vez por sessão."""
+    from src.data.validator import SRAGDataValidator
+    return SRAGDataValidator()
+
+@pytest.fixture
+def validator(validator_session):
+    """Validador com estatísticas zeradas para cada teste."""
+    return _with_fresh_stats(validator_session, 'validation_stats')
+
+@pytest.fixture(scope="session")
+def processor_session():
+    """Instância do SRAGDataProcessor criada uma vez por sessão."""
+    from src.data.processor import SRAGDataProcessor
+    return SRAGDataProcessor()
+
+@pytest.fixture
+def processor(processor_session):
+    """Processador (e seu validador) com estatísticas zeradas para cada teste."""
+    fresh = _with_fresh_stats(processor_session, 'processing_stats')
+    fresh.validator = _with_fresh_stats(processor_session.validator, 'validation_stats')
+    return fresh
+
+def _random_categorical(rng, categories, n_records: int) -> pd.Categorical:
+    """
+    Coluna categórica com códigos int8 sorteados uniformemente.
+    
+    Args:
+        rng: Gerador NumPy
+        categories: Valores possíveis
+        n_records: Número de registros
+        
+    Returns:
+        Categorical com 1 byte por registro
+    """
+    codes = rng.integers(0, len(categories), n_records, dtype=np.int8)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+@pytest.fixture(scope="session")
+def large_dataset():
+    """
+    Dataset grande para testes de performance, gerado uma vez por sessão.
+    
+    Não deve ser modificado pelos testes; faça `.copy()` antes de alterar.
+    
+    Returns:
+        DataFrame com 10.000 registros
+    """
+    n_records = 10000  # Dataset maior para teste de performance
+    rng = np.random.default_rng(0)
+    
+    # Datas horárias formatadas só uma vez por dia distinto (~417 de 10.000)
+    dates = pd.date_range('2020-01-01', periods=n_records, freq='h')
+    day_codes, unique_days = pd.factorize(dates.floor('D'))
+    formatted_dates = pd.Categorical.from_codes(
+        day_codes, categories=unique_days.strftime('%d/%m/%Y')
+    )
+    
+    # Uma coluna por array, na ordem de LARGE_DATASET_COLUMNS
+    arrays = [
+        formatted_dates,
+        _random_categorical(rng, UFS, n_records),
+        rng.integers(0, 100, n_records, dtype=np.int8),
+        _random_categorical(rng, SEX, n_records),
+        _random_categorical(rng, YN, n_records),
+        _random_categorical(rng, EVO, n_records),
+        _random_categorical(rng, YN, n_records),
+        _random_categorical(rng, YN, n_records)
+    ]
+    
+    return pd.DataFrame(dict(zip(LARGE_DATASET_COLUMNS, arrays)), copy=False)
+
+@pytest.fixture(scope="session")
+def large_csv_file(large_dataset, tmp_path_factory):
+    """
+    CSV do dataset grande, escrito uma vez por sessão.
+    
+    Args:
+        large_dataset: Dataset grande de performance
+        tmp_path_factory: Fábrica de diretórios temporários do pytest
+        
+    Returns:
+        Path para arquivo CSV criado
+    """
+    csv_file = tmp_path_factory.mktemp("perf") / "large_srag.csv"
+    large_dataset.to_csv(csv_file, sep=';', index=False, encoding='latin-1')
+    return csv_file
+
+@pytest.fixture(scope="session")
+def large_parquet_file(large_dataset, tmp_path_factory):
+    """
+    Parquet do dataset grande, escrito uma vez por sessão.
+    
+    Args:
+        large_dataset: Dataset grande de performance
+        tmp_path_factory: Fábrica de diretórios temporários do pytest
+        
+    Returns:
+        Path para arquivo Parquet criado
+    """
+    parquet_file = tmp_path_factory.mktemp("perf") / "large_srag.parquet"
+    large_dataset.to_parquet(parquet_file, engine='pyarrow', index=False)
+    return parquet_file
+
+def _spread_mask(n_records: int, share: float) -> np.ndarray:
+    """
+    Máscara com `share` dos registros marcados, espalhados uniformemente.
+    
+    Qualquer janela de w registros contém floor ou ceil de share * w
+    marcados, então as janelas de 30 e 90 dias das métricas mantêm a
+    proporção conhecida.
+    
+    Args:
+        n_records: Número de registros
+        share: Fração de registros marcados
+        
+    Returns:
+        Array booleano de tamanho n_records
+    """
+    positions = np.arange(n_records + 1) * share
+    return np.diff(np.floor(positions)) > 0
+
+def _binary_column(mask: np.ndarray, marked: str) -> pd.Categorical:
+    """
+    Coluna categórica '1'/'2' com `marked` onde a máscara é verdadeira.
+    
+    Args:
+        mask: Máscara gerada por _spread_mask
+        marked: Valor dos registros marcados ('1' ou '2')
+        
+    Returns:
+        Categorical com categorias ['1', '2']
+    """
+    other = '2' if marked == '1' else '1'
+    return pd.Categorical(np.where(mask, marked, other), categories=['1', '2'])
+
+@pytest.fixture(scope="session")
+def metrics_test_data():
+    """
+    Dados com padrões conhecidos para validar cálculos de métricas.
+    
+    Compartilhado pela sessão; os testes apenas leem o DataFrame.
+    
+    Returns:
+        DataFrame com um registro por dia de 2024
+    """
+    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
+    n_records = len(dates)
+    
+    data = pd.DataFrame({
+        'DT_NOTIFIC': dates,
+        'EVOLUCAO': _binary_column(_spread_mask(n_records, 0.2), '2'),  # 20% óbitos
+        'UTI': _binary_column(_spread_mask(n_records, 0.3), '1'),  # 30% UTI
+        # Doses são datas; NaT = dose não aplicada
+        'DOSE_1_COV': dates.where(_spread_mask(n_records, 0.85)),  # 85% vacinados
+        'DOSE_2_COV': dates.where(_spread_mask(n_records, 0.75)),  # 75% com 2ª dose
+    })
+    
+    return data
+
 @pytest.fixture
 def mock_news_articles():
     """
@@ -1,34 +1,48 @@
 import pytest
+import contextlib
+import io
+import runpy
 import subprocess
 import sys
+from pathlib import Path
 from unittest.mock import patch
 
+# Ponto de entrada da CLI, resolvido a partir da raiz do repositório
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / 'src' / 'main.py'
+
+@pytest.fixture(scope="module")
+def help_run():
+    """
+    Executa `main.py --help` uma única vez no mesmo processo.
+    
+    Returns:
+        Tupla (código de saída, stdout) reaproveitada pelos testes do módulo
+    """
+    stdout = io.StringIO()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(sys, 'argv', [str(MAIN_SCRIPT), '--help'])
+        with contextlib.redirect_stdout(stdout), pytest.raises(SystemExit) as exc_info:
+            runpy.run_path(str(MAIN_SCRIPT), run_name='__main__')
+    return exc_info.value.code, stdout.getvalue()
+
+@pytest.mark.slow
+@pytest.mark.integration
 class TestCommandLineInterface:
     """Testes para interface de linha de comando."""
     
-    def test_main_help_option(self):
-        """Testa opção de help do main.py."""
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py', '--help'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            assert result.returncode == 0
-            assert 'usage:' in result.stdout.lower() or 'Sistema de Relatórios' in result.stdout
-            
-        except subprocess.TimeoutExpired:
-            pytest.skip("Comando demorou muito para executar")
-        except Exception as e:
-            pytest.skip(f"Erro ao executar comando: {e}")
+    def test_main_help_option(self, help_run):
+        """Testa opção de help do main.py (no mesmo processo, sem subprocess)."""
+        exit_code, stdout = help_run
+        
+        assert exit_code == 0
+        assert 'usage:' in stdout.lower()
+        assert 'Sistema de Relatórios' in stdout
     
     def test_status_only_option(self):
         """Testa opção --status-only."""
         try:
             result = subprocess.run(
-                [sys.executable, 'main.py', '--status-only'],
+                [sys.executable, str(MAIN_SCRIPT), '--status-only'],
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -1,15 +1,9 @@
 import pytest
 import pandas as pd
-from src.data.processor import SRAGDataProcessor
 
 class TestSRAGDataProcessor:
     """Testes para o processador de dados SRAG."""
     
-    @pytest.fixture
-    def processor(self):
-        """Fixture para instância do processador."""
-        return SRAGDataProcessor()
-    
     @pytest.mark.asyncio
     async def test_load_and_process(self, processor, sample_csv_file):
         """Testa carregamento e processamento completo."""
@@ -54,4 +48,45 @@ class TestSRAGDataProcessor:
         
         # Verificar se dados foram salvos corretamente
         loaded_data = pd.read_parquet(saved_path)
-        assert len(loaded_data) == len(sample_srag_data)
\ No newline at end of file
+        assert len(loaded_data) == len(sample_srag_data)
+    
+    def test_optimize_memory_usage(self, processor, sample_srag_data):
+        """Testa redução de dtypes e reuso do plano para o mesmo schema."""
+        from src.data.processor import _plan_dtypes
+        
+        _plan_dtypes.cache_clear()
+        
+        optimized = processor._optimize_memory_usage(sample_srag_data)
+        processor._optimize_memory_usage(sample_srag_data)
+        
+        assert optimized.memory_usage(deep=True).sum() <= sample_srag_data.memory_usage(deep=True).sum()
+        assert optimized['SG_UF_NOT'].dtype == 'category'
+        assert optimized['NU_IDADE_N'].dtype == 'float32'
+        assert _plan_dtypes.cache_info().hits == 1
+    
+    def test_optimize_memory_usage_keeps_float_precision(self, processor):
+        """Floats só viram float32 quando a conversão é exata."""
+        data = pd.DataFrame({
+            'idade': [1.0, 25.0, None],
+            'contagem': [16_777_217.0, 1.0, 2.0],  # 2**24 + 1 não cabe em float32
+            'taxa': [0.1, 0.2, 0.3]
+        })
+        
+        optimized = processor._optimize_memory_usage(data)
+        
+        assert optimized['idade'].dtype == 'float32'
+        assert optimized['contagem'].dtype == 'float64'
+        assert optimized['taxa'].dtype == 'float64'
+        pd.testing.assert_frame_equal(optimized, data, check_dtype=False)
+    
+    def test_optimize_memory_usage_skips_unhashable_values(self, processor):
+        """Colunas com valores não hasheáveis ficam como object."""
+        data = pd.DataFrame({
+            'metadados': [{'fonte': 'SIVEP'}] * 5,
+            'uf': ['SP', 'SP', 'RJ', 'SP', 'SP']
+        })
+        
+        optimized = processor._optimize_memory_usage(data)
+        
+        assert optimized['metadados'].dtype == object
+        assert optimized['uf'].dtype == 'category'
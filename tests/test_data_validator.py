@@ -1,15 +1,9 @@
 import pytest
 import pandas as pd
-from src.data.validator import SRAGDataValidator
 
 class TestSRAGDataValidator:
     """Testes para o validador de dados SRAG."""
     
-    @pytest.fixture
-    def validator(self):
-        """Fixture para instância do validador."""
-        return SRAGDataValidator()
-    
     def test_initialization(self, validator):
         """Testa inicialização do validador."""
         assert hasattr(validator, 'validation_rules')
@@ -1,18 +1,50 @@
 import pytest
+import os
 import pandas as pd
 import numpy as np
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 import asyncio
 
+# Gerador com semente: dados reproduzíveis entre execuções
+RNG = np.random.default_rng(12345)
+
+@pytest.fixture(autouse=True)
+def news_sleep(monkeypatch):
+    """
+    Anula as esperas de rate limiting do news_tool nestes testes.
+    
+    Só o nome `sleep` do módulo news_tool é substituído; asyncio.sleep
+    continua intacto para o restante do código.
+    
+    Returns:
+        AsyncMock no lugar da espera
+    """
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr("src.tools.news_tool.sleep", mock_sleep)
+    return mock_sleep
+
+@pytest.fixture
+def restricted_file(tmp_path):
+    """Arquivo CSV sem permissão de leitura; permissões restauradas no teardown."""
+    path = tmp_path / "restricted.csv"
+    path.write_text("test,data\n1,2")
+    path.chmod(0o000)  # Sem permissões
+    
+    if os.access(path, os.R_OK):
+        path.chmod(0o644)
+        pytest.skip("Usuário atual ignora permissões de arquivo (root)")
+    
+    yield path
+    
+    # Restaurar permissões para limpeza
+    path.chmod(0o644)
+
 class TestErrorHandling:
     """Testes para tratamento de erros e casos extremos."""
     
     @pytest.mark.asyncio
-    async def test_empty_dataset_handling(self):
+    async def test_empty_dataset_handling(self, metrics_tool):
         """Testa tratamento de datasets vazios."""
-        from src.tools.metrics_tool import MetricsCalculatorTool
-        
-        metrics_tool = MetricsCalculatorTool()
         empty_df = pd.DataFrame()
         
         # Todas as métricas devem lidar graciosamente com dados vazios
@@ -25,40 +57,36 @@ class TestErrorHandling:
         result = await metrics_tool.calculate_vaccination_rate(empty_df, "2024-01-01")
         assert result['rate'] == 0.0
     
-    @pytest.mark.asyncio
-    async def test_corrupted_data_handling(self):
-        """Testa tratamento de dados corrompidos."""
-        from src.data.processor import SRAGDataProcessor
-        
-        # Criar dados corrompidos
-        corrupted_data = pd.DataFrame({
-            'DT_NOTIFIC': ['invalid_date', '32/13/2024', None],
-            'NU_IDADE_N': ['not_a_number', -999, 'abc'],
-            'CS_SEXO': [None, 'INVALID', 123],
-            'EVOLUCAO': ['', 'WRONG', None]
-        })
-        
-        processor = SRAGDataProcessor()
-        
-        # Processador deve lidar com dados corrompidos sem crash
-        try:
-            result = await processor.load_and_process(
+    def test_missing_data_file(self, processor, tmp_path):
+        """Testa erro específico quando o arquivo de dados não existe."""
+        with pytest.raises(FileNotFoundError):
+            processor.load_and_process(
+                file_path=str(tmp_path / "inexistente.csv"),
                 start_date="2023-01-01",
                 end_date="2023-12-31"
             )
-            # Se chegou aqui, tratamento de erro está funcionando
-        except FileNotFoundError:
-            # Esperado quando arquivo não existe
-            pass
-        except Exception as e:
-            # Outras exceções devem ser específicas e tratadas
-            pytest.fail(f"Erro não tratado adequadamente: {e}")
+    
+    @pytest.mark.parametrize("source, expected_error", [
+        ("empty_file", pd.errors.EmptyDataError),
+        ("directory", IsADirectoryError),
+    ])
+    def test_invalid_data_source(self, processor, tmp_path, source, expected_error):
+        """Testa que fontes de dados inválidas geram exceções tipadas."""
+        if source == "empty_file":
+            path = tmp_path / "vazio.csv"
+            path.write_text("")
+        else:
+            path = tmp_path
+        
+        with pytest.raises(expected_error):
+            processor.load_and_process(file_path=str(path))
     
     def test_network_timeout_simulation(self):
         """Testa tratamento de timeout de rede."""
         from src.tools.news_tool import NewsSearchTool
         
         news_tool = NewsSearchTool()
+        news_tool.news_api_key = 'test-key'  # Forçar o caminho da News API
         
         # Simular timeout
         with patch('aiohttp.ClientSession.get') as mock_get:
@@ -67,10 +95,14 @@ class TestErrorHandling:
             # Tool deve lidar graciosamente com timeout
             try:
                 result = asyncio.run(news_tool._search_news_api(30))
-                assert isinstance(result, list)  # Deve retornar lista vazia
-                assert len(result) == 0
             except Exception as e:
                 pytest.fail(f"Timeout não tratado adequadamente: {e}")
+        
+        # A primeira requisição falha e a tool recorre às notícias de fallback
+        assert mock_get.call_count == 1
+        assert isinstance(result, list)
+        assert result
+        assert all(article['source_type'] == 'fallback' for article in result)
     
     def test_invalid_configuration_handling(self):
         """Testa tratamento de configurações inválidas."""
@@ -89,37 +121,19 @@ class TestErrorHandling:
             assert isinstance(settings.system.timeout_seconds, int)
             assert settings.system.log_level.value in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
     
-    def test_file_permission_errors(self, tmp_path):
+    def test_file_permission_errors(self, processor, restricted_file):
         """Testa tratamento de erros de permissão de arquivo."""
-        from src.data.processor import SRAGDataProcessor
-        
-        # Criar arquivo sem permissão de leitura
-        restricted_file = tmp_path / "restricted.csv"
-        restricted_file.write_text("test,data\n1,2")
-        restricted_file.chmod(0o000)  # Sem permissões
-        
-        processor = SRAGDataProcessor()
-        
-        try:
-            # Deve falhar graciosamente
-            result = asyncio.run(processor.load_and_process(str(restricted_file)))
-            pytest.fail("Deveria ter falhado com erro de permissão")
-        except (PermissionError, OSError):
-            # Esperado
-            pass
-        finally:
-            # Restaurar permissões para limpeza
-            try:
-                restricted_file.chmod(0o644)
-            except:
-                pass
+        # Deve falhar com erro de permissão
+        with pytest.raises((PermissionError, OSError)):
+            processor.load_and_process(str(restricted_file))
     
     @pytest.mark.asyncio
-    async def test_api_rate_limit_handling(self):
+    async def test_api_rate_limit_handling(self, news_sleep):
         """Testa tratamento de rate limiting de APIs."""
         from src.tools.news_tool import NewsSearchTool
         
         news_tool = NewsSearchTool()
+        news_tool.news_api_key = 'test-key'  # Forçar o caminho da News API
         
         # Simular resposta de rate limit
         with patch('aiohttp.ClientSession.get') as mock_get:
@@ -130,20 +144,22 @@ class TestErrorHandling:
             
             # Tool deve lidar com rate limiting
             result = await news_tool._search_news_api(30)
-            assert isinstance(result, list)
-            assert len(result) == 0  # Deve retornar vazio quando rate limited
+        
+        # Cada termo é tentado, com espera entre requisições, sem exceção
+        assert mock_get.call_count == 3
+        assert news_sleep.await_count == 3
+        # Sem artigos da API, a tool recorre às notícias de fallback
+        assert isinstance(result, list)
+        assert result
+        assert all(article['source_type'] == 'fallback' for article in result)
     
-    def test_memory_pressure_handling(self):
+    def test_memory_pressure_handling(self, processor):
         """Testa comportamento sob pressão de memória."""
-        from src.data.processor import SRAGDataProcessor
-        
         # Criar dataset que simula uso alto de memória
         large_data = pd.DataFrame({
-            'col_' + str(i): np.random.randn(1000) for i in range(100)
+            'col_' + str(i): RNG.standard_normal(1000) for i in range(100)
         })
         
-        processor = SRAGDataProcessor()
-        
         # Deve processar sem crash mesmo com dados grandes
         try:
             result = processor._optimize_memory_usage(large_data)
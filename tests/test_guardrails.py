@@ -1,15 +1,9 @@
 import pytest
 import pandas as pd
-from src.utils.guardrails import SRAGGuardrails
 
 class TestSRAGGuardrails:
     """Testes para o sistema de guardrails."""
     
-    @pytest.fixture
-    def guardrails(self):
-        """Fixture para instância do SRAGGuardrails."""
-        return SRAGGuardrails()
-    
     def test_initialization(self, guardrails):
         """Testa inicialização dos guardrails."""
         assert hasattr(guardrails, 'sensitive_columns')
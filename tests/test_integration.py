@@ -1,22 +1,26 @@
 import pytest
 import asyncio
+from pathlib import Path
 from unittest.mock import patch, AsyncMock
 from main import SRAGApplication
+from src.config.settings import settings
 
 class TestSystemIntegration:
     """Testes de integração do sistema completo."""
     
+    @pytest.fixture(autouse=True)
+    def _patch_settings(self, monkeypatch, temp_directories):
+        """Aponta as configurações globais para os diretórios temporários."""
+        # monkeypatch restaura os valores originais no teardown
+        monkeypatch.setattr(settings.system, 'data_dir', Path(temp_directories['data']))
+        monkeypatch.setattr(settings.system, 'logs_dir', Path(temp_directories['logs']))
+        monkeypatch.setattr(settings.system, 'reports_dir', Path(temp_directories['reports']))
+        monkeypatch.setattr(settings.database, 'data_path', temp_directories['raw'] + '/srag_data.csv')
+    
     @pytest.fixture
-    def app(self, temp_directories):
+    def app(self):
         """Fixture para aplicação completa."""
-        # Configurar diretórios temporários
-        with patch('src.config.settings.settings') as mock_settings:
-            mock_settings.system.data_dir = temp_directories['data']
-            mock_settings.system.logs_dir = temp_directories['logs']
-            mock_settings.system.reports_dir = temp_directories['reports']
-            mock_settings.database.data_path = temp_directories['raw'] + '/srag_data.csv'
-            
-            return SRAGApplication()
+        return SRAGApplication()
     
     def test_application_initialization(self, app):
         """Testa inicialização da aplicação."""
@@ -0,0 +1,221 @@
+import pytest
+from types import SimpleNamespace
+
+from src.utils import llm_gemini
+from src.utils.llm_gemini import (
+    GeminiLLM, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS,
+    NEWS_DEDUP_THRESHOLD, _estimate_tokens, _jaccard, _title_shingles
+)
+
+class TransientError(Exception):
+    """Erro transitório simulado (ex.: 503 da API)."""
+
+class StubModel:
+    """Modelo Gemini falso que devolve (ou lança) os resultados em ordem."""
+    
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+    
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        # O último resultado se repete quando a lista acaba
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(text=outcome)
+
+class FakeClock:
+    """Substitui o módulo time: relógio controlado e sleep registrado."""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio falso no lugar do módulo time usado pelo llm_gemini."""
+    fake = FakeClock()
+    monkeypatch.setattr(llm_gemini, 'time', fake)
+    return fake
+
+@pytest.fixture
+def gemini(monkeypatch, clock):
+    """GeminiLLM sem SDK real: modelo, config e erros retentáveis simulados."""
+    monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+    client = GeminiLLM()
+    client._genai = SimpleNamespace(
+        types=SimpleNamespace(GenerationConfig=lambda **kwargs: kwargs)
+    )
+    client._retryable_errors = (TransientError,)
+    client.max_retry_attempts = 3
+    return client
+
+class TestGeminiRetry:
+    """Testes de retry com backoff e circuit breaker do cliente Gemini."""
+    
+    def test_retries_transient_errors_then_succeeds(self, gemini, clock):
+        """Erros transitórios são repetidos com backoff exponencial."""
+        gemini.model = StubModel(TransientError(), TransientError(), "ok")
+        
+        assert gemini._generate_with_timeout("prompt") == "ok"
+        assert gemini.model.calls == 3
+        
+        # Backoff: 1s e 2s, cada um com até 1s de jitter
+        assert len(clock.sleeps) == 2
+        assert 1.0 <= clock.sleeps[0] < 2.0
+        assert 2.0 <= clock.sleeps[1] < 3.0
+        assert gemini._breaker['fails'] == 0
+    
+    def test_gives_up_after_max_attempts(self, gemini, clock):
+        """Após esgotar as tentativas o erro é propagado e conta uma falha."""
+        gemini.model = StubModel(TransientError())
+        
+        with pytest.raises(TransientError):
+            gemini._generate_with_timeout("prompt")
+        
+        assert gemini.model.calls == gemini.max_retry_attempts
+        assert len(clock.sleeps) == gemini.max_retry_attempts - 1
+        assert gemini._breaker['fails'] == 1
+    
+    def test_non_retryable_error_is_not_retried(self, gemini, clock):
+        """Erros não transitórios falham na primeira tentativa."""
+        gemini.model = StubModel(ValueError("prompt inválido"))
+        
+        with pytest.raises(ValueError):
+            gemini._generate_with_timeout("prompt")
+        
+        assert gemini.model.calls == 1
+        assert clock.sleeps == []
+    
+    def test_breaker_opens_after_consecutive_failures(self, gemini, clock):
+        """Com o breaker aberto o modelo nem é chamado."""
+        gemini.model = StubModel(ValueError("falha"))
+        
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(ValueError):
+                gemini._generate_with_timeout("prompt")
+        
+        with pytest.raises(RuntimeError, match="Circuit breaker"):
+            gemini._generate_with_timeout("prompt")
+        assert gemini.model.calls == BREAKER_FAILURE_THRESHOLD
+    
+    def test_breaker_half_open_recovery(self, gemini, clock):
+        """Passada a janela, uma chamada de teste fecha ou reabre o breaker."""
+        gemini.model = StubModel(ValueError("falha"))
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(ValueError):
+                gemini._generate_with_timeout("prompt")
+        
+        # Meio-aberto: a chamada de teste falha e o breaker reabre na hora
+        clock.now += BREAKER_RESET_SECONDS
+        with pytest.raises(ValueError):
+            gemini._generate_with_timeout("prompt")
+        with pytest.raises(RuntimeError, match="Circuit breaker"):
+            gemini._generate_with_timeout("prompt")
+        
+        # Meio-aberto de novo: sucesso fecha o breaker
+        clock.now += BREAKER_RESET_SECONDS
+        gemini.model = StubModel("ok")
+        assert gemini._generate_with_timeout("prompt") == "ok"
+        assert gemini._breaker['fails'] == 0
+        assert gemini._generate_with_timeout("prompt") == "ok"
+    
+    @pytest.mark.asyncio
+    async def test_open_breaker_falls_back(self, gemini, clock):
+        """Com o breaker aberto a geração usa as explicações fallback."""
+        gemini.model = StubModel("nunca chamado")
+        gemini._breaker.update(fails=BREAKER_FAILURE_THRESHOLD, opened_at=clock.now)
+        
+        metrics = {'mortality_rate': {'rate': 8.5}}
+        explanations = await gemini.generate_metrics_explanation(metrics)
+        
+        assert 'mortality_rate' in explanations
+        assert gemini.model.calls == 0
+
+def _article(title, summary="Resumo da notícia."):
+    """Artigo mínimo no formato usado pelo contexto de notícias."""
+    return {
+        'title': title,
+        'summary': summary,
+        'source': 'g1.com',
+        'published': '2024-06-15'
+    }
+
+class TestGeminiNewsContext:
+    """Testes da deduplicação e do orçamento de tokens do contexto de notícias."""
+    
+    BASE_TITLE = "Casos de SRAG aumentam em São Paulo"
+    
+    def test_jaccard(self):
+        """Jaccard de trigramas ignora caixa e espaços e é 0 para vazios."""
+        base = _title_shingles(self.BASE_TITLE)
+        
+        assert _jaccard(base, _title_shingles("casos  de srag AUMENTAM em são paulo")) == 1.0
+        assert _jaccard(base, _title_shingles("")) == 0.0
+        assert _jaccard(frozenset(), frozenset()) == 0.0
+    
+    def test_near_duplicate_titles_are_dropped(self, gemini):
+        """Títulos acima do limiar de similaridade entram uma única vez."""
+        near_duplicate = self.BASE_TITLE + "!"
+        distinct = "Casos de SRAG aumentam em São Paulo e Campinas"
+        
+        base = _title_shingles(self.BASE_TITLE)
+        assert _jaccard(base, _title_shingles(near_duplicate)) >= NEWS_DEDUP_THRESHOLD
+        assert _jaccard(base, _title_shingles(distinct)) < NEWS_DEDUP_THRESHOLD
+        
+        context = gemini._prepare_news_context([
+            _article(self.BASE_TITLE),
+            _article(near_duplicate),
+            _article(distinct)
+        ])
+        
+        assert "1. [g1.com] " + self.BASE_TITLE + "\n" in context
+        assert "2. [g1.com] " + distinct in context
+        assert near_duplicate not in context
+        assert "3. " not in context
+    
+    def test_context_respects_token_budget(self, gemini):
+        """Artigos que estourariam o orçamento de tokens ficam de fora."""
+        articles = [_article(f"Notícia {i} sobre {tema}", "x" * 150)
+                    for i, tema in enumerate(["UTI", "vacina", "óbitos", "leitos"])]
+        item_tokens = _estimate_tokens(gemini._format_news_item(1, articles[0]))
+        
+        # Cabem exatamente dois artigos
+        gemini.news_token_budget = 2 * item_tokens + 1
+        context = gemini._prepare_news_context(articles)
+        
+        assert articles[0]['title'] in context
+        assert articles[1]['title'] in context
+        assert articles[2]['title'] not in context
+    
+    def test_first_article_always_included(self, gemini):
+        """Mesmo acima do orçamento, o primeiro artigo é mantido."""
+        gemini.news_token_budget = 1
+        context = gemini._prepare_news_context([
+            _article("Ocupação de UTI preocupa"),
+            _article("Campanha de vacinação começa")
+        ])
+        
+        assert "Ocupação de UTI preocupa" in context
+        assert "Campanha de vacinação começa" not in context
+    
+    def test_context_limited_to_ten_articles(self, gemini):
+        """Com orçamento folgado, o contexto ainda é limitado a 10 notícias."""
+        gemini.news_token_budget = 10**6
+        articles = [_article(f"Boletim {i}: {tema}") for i, tema in enumerate(
+            "UTI vacina óbitos leitos internações gripe influenza covid vírus "
+            "hospitais crianças idosos".split()
+        )]
+        
+        context = gemini._prepare_news_context(articles)
+        
+        assert "10. " in context
+        assert "11. " not in context
+
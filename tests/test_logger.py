@@ -0,0 +1,69 @@
+import gzip
+import logging
+import pytest
+
+from src.utils.logger import BufferedRotatingFileHandler, _gzip_namer, _gzip_rotator
+
+def _record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    """Registro de log mínimo para alimentar o handler diretamente."""
+    return logging.LogRecord("srag.test", level, __file__, 1, message, None, None)
+
+@pytest.fixture
+def log_handler(tmp_path):
+    """Handler rotativo de 100 bytes, com compressão gzip como em produção."""
+    handler = BufferedRotatingFileHandler(
+        tmp_path / "srag_system.log",
+        maxBytes=100,
+        backupCount=2,
+        encoding='utf-8'
+    )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    yield handler
+    handler.close()
+
+class TestBufferedRotatingFileHandler:
+    """Testes de rotação e compressão do arquivo de log do sistema."""
+    
+    def test_rotation_counts_bytes_not_characters(self, log_handler, tmp_path):
+        """Texto em português ocupa 2 bytes por 'ç': rotaciona antes de exceder."""
+        message = "ç" * 30  # 30 caracteres, 61 bytes com o terminador
+        
+        log_handler.emit(_record(message))
+        log_handler.emit(_record(message))
+        log_handler.flush()
+        
+        rotated = tmp_path / "srag_system.log.1.gz"
+        assert rotated.exists()
+        with gzip.open(rotated, 'rt', encoding='utf-8') as f:
+            assert f.read() == message + "\n"
+        
+        current = tmp_path / "srag_system.log"
+        assert current.read_text(encoding='utf-8') == message + "\n"
+        assert current.stat().st_size <= 100
+    
+    def test_backups_are_gzipped_and_capped(self, log_handler, tmp_path):
+        """Backups antigos são comprimidos e limitados a backupCount."""
+        for i in range(6):
+            log_handler.emit(_record(f"registro {i} " + "x" * 80))
+        log_handler.flush()
+        
+        assert (tmp_path / "srag_system.log.1.gz").exists()
+        assert (tmp_path / "srag_system.log.2.gz").exists()
+        assert not (tmp_path / "srag_system.log.3.gz").exists()
+        # O rotator remove o arquivo não comprimido
+        assert not (tmp_path / "srag_system.log.1").exists()
+        
+        with gzip.open(tmp_path / "srag_system.log.1.gz", 'rt', encoding='utf-8') as f:
+            assert f.read().startswith("registro 4 ")
+    
+    def test_warning_flushes_buffer(self, log_handler, tmp_path):
+        """INFO fica no buffer; WARNING força o flush para o disco."""
+        current = tmp_path / "srag_system.log"
+        
+        log_handler.emit(_record("info"))
+        assert current.read_text(encoding='utf-8') == ""
+        
+        log_handler.emit(_record("alerta", logging.WARNING))
+        assert current.read_text(encoding='utf-8') == "info\nalerta\n"
@@ -1,123 +1,182 @@
 import pytest
 import time
+import functools
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import asyncio
-import psutil
-import gc
+import tracemalloc
+
+@functools.lru_cache(maxsize=8)
+def _make_srag_frame(n_records: int, seed: int, freq: str = 'h') -> pd.DataFrame:
+    """
+    Dataset de métricas reproduzível, construído uma vez por (n, seed, freq).
+    
+    O DataFrame retornado fica no cache e é compartilhado; quem usa deve
+    trabalhar sobre `.copy()`.
+    
+    Args:
+        n_records: Número de registros
+        seed: Semente do gerador NumPy
+        freq: Frequência das datas de notificação
+        
+    Returns:
+        DataFrame com DT_NOTIFIC (datetime64), EVOLUCAO, UTI e DOSE_1_COV
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'DT_NOTIFIC': pd.date_range('2023-01-01', periods=n_records, freq=freq),
+        'EVOLUCAO': rng.integers(1, 3, n_records).astype('U1'),
+        'UTI': rng.integers(1, 3, n_records).astype('U1'),
+        'DOSE_1_COV': rng.integers(1, 3, n_records).astype('U1')
+    })
+
+@pytest.fixture(scope="module")
+def concurrent_datasets():
+    """
+    Cinco datasets pequenos para testes de operações concorrentes.
+    
+    Returns:
+        Tupla com 5 DataFrames de 1.000 registros
+    """
+    return tuple(_make_srag_frame(1000, seed).copy() for seed in range(1, 6))
+
+@pytest.fixture(scope="module")
+def wide_dataset(large_dataset):
+    """
+    large_dataset com os dtypes largos de um CSV recém-lido.
+    
+    Colunas categóricas voltam a ser object e a idade volta a int64,
+    que é exatamente o que o otimizador de memória deve reduzir.
+    
+    Returns:
+        DataFrame de 10.000 registros com colunas object e int64
+    """
+    dtypes = {col: object for col in large_dataset.columns}
+    dtypes['NU_IDADE_N'] = 'int64'
+    return large_dataset.astype(dtypes)
+
+def _optimize_traced(processor, data):
+    """
+    Executa _optimize_memory_usage medindo o pico de alocação.
+    
+    O pico do tracemalloc é determinístico, ao contrário do RSS.
+    
+    Args:
+        processor: Instância de SRAGDataProcessor
+        data: DataFrame a otimizar (recebe uma cópia rasa)
+        
+    Returns:
+        Tupla (DataFrame otimizado, pico de alocação em bytes)
+    """
+    tracemalloc.start()
+    try:
+        optimized = processor._optimize_memory_usage(data.copy(deep=False))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return optimized, peak
+
+async def _bench(coro_fn, n=3):
+    """
+    Mede uma corrotina no estilo pytest-benchmark.
+    
+    Faz uma execução de aquecimento (imports tardios, caches) e devolve o
+    menor tempo de `n` execuções, o que filtra o ruído de GC e agendamento.
+    
+    Args:
+        coro_fn: Função sem argumentos que retorna o awaitable a medir
+        n: Número de execuções cronometradas
+        
+    Returns:
+        Menor tempo observado, em segundos
+    """
+    await coro_fn()  # aquecimento
+    times = []
+    for _ in range(n):
+        start_time = time.perf_counter()
+        await coro_fn()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
 
 class TestSystemPerformance:
     """Testes de performance e otimização do sistema."""
     
-    @pytest.fixture
-    def large_dataset(self):
-        """Cria dataset grande para testes de performance."""
-        n_records = 10000  # Dataset maior para teste de performance
-        
-        data = {
-            'DT_NOTIFIC': pd.date_range('2020-01-01', periods=n_records, freq='H').strftime('%d/%m/%Y'),
-            'SG_UF': np.random.choice(['SP', 'RJ', 'MG', 'PR', 'RS'], n_records),
-            'NU_IDADE_N': np.random.randint(0, 100, n_records),
-            'CS_SEXO': np.random.choice(['M', 'F'], n_records),
-            'UTI': np.random.choice(['1', '2'], n_records),
-            'EVOLUCAO': np.random.choice(['1', '2', '3'], n_records),
-            'FEBRE': np.random.choice(['1', '2'], n_records),
-            'TOSSE': np.random.choice(['1', '2'], n_records)
-        }
-        
-        return pd.DataFrame(data)
-    
-    def test_data_loading_performance(self, large_dataset, tmp_path):
-        """Testa performance de carregamento de dados."""
-        # Salvar dataset grande
-        csv_file = tmp_path / "large_srag.csv"
-        large_dataset.to_csv(csv_file, sep=';', index=False, encoding='latin-1')
-        
-        from src.data.processor import SRAGDataProcessor
-        processor = SRAGDataProcessor()
-        
-        # Medir tempo de carregamento
-        start_time = time.time()
-        
-        # Simular carregamento (sem processamento completo)
-        data = pd.read_csv(csv_file, sep=';', encoding='latin-1')
-        
-        loading_time = time.time() - start_time
-        
-        assert loading_time < 5.0  # Deve carregar em menos de 5 segundos
+    def test_data_loading_performance(self, large_dataset, large_csv_file, large_parquet_file):
+        """Testa performance de carregamento de dados (CSV via Arrow e Parquet)."""
+        # Simular carregamento (sem processamento completo) com o parser do Arrow
+        start_time = time.perf_counter()
+        data = pd.read_csv(
+            large_csv_file, sep=';', encoding='latin-1',
+            engine='pyarrow', dtype_backend='pyarrow'
+        )
+        csv_time = time.perf_counter() - start_time
+        
+        # Referência rápida: formato colunar binário
+        start_time = time.perf_counter()
+        parquet_data = pd.read_parquet(large_parquet_file, engine='pyarrow')
+        parquet_time = time.perf_counter() - start_time
+        
+        assert csv_time < 1.0  # Deve carregar em menos de 1 segundo
+        assert parquet_time < 1.0
         assert len(data) == len(large_dataset)
+        assert len(parquet_data) == len(large_dataset)
     
     @pytest.mark.asyncio
-    async def test_metrics_calculation_performance(self):
+    async def test_metrics_calculation_performance(self, metrics_tool):
         """Testa performance do cálculo de métricas."""
-        from src.tools.metrics_tool import MetricsCalculatorTool
-        
-        # Criar dados de teste
-        n_records = 5000
-        test_data = pd.DataFrame({
-            'DT_NOTIFIC': pd.date_range('2023-01-01', periods=n_records, freq='6H'),
-            'EVOLUCAO': np.random.choice(['1', '2'], n_records),
-            'UTI': np.random.choice(['1', '2'], n_records),
-            'DOSE_1_COV': np.random.choice(['1', '2'], n_records)
-        })
-        
-        metrics_tool = MetricsCalculatorTool()
-        
-        # Medir tempo de cálculo de cada métrica
-        metrics_times = {}
-        
-        start_time = time.time()
-        result = await metrics_tool.calculate_mortality_rate(test_data, "2023-06-15")
-        metrics_times['mortality'] = time.time() - start_time
-        
-        start_time = time.time()
-        result = await metrics_tool.calculate_icu_occupancy_rate(test_data, "2023-06-15")
-        metrics_times['icu'] = time.time() - start_time
-        
-        start_time = time.time()
-        result = await metrics_tool.calculate_vaccination_rate(test_data, "2023-06-15")
-        metrics_times['vaccination'] = time.time() - start_time
-        
-        # Cada métrica deve ser calculada em menos de 2 segundos
-        for metric, calc_time in metrics_times.items():
-            assert calc_time < 2.0, f"Métrica {metric} muito lenta: {calc_time}s"
+        # Dados de teste com DT_NOTIFIC já em datetime64, fora da medição
+        test_data = _make_srag_frame(5000, 12345, '6h').copy()
+        
+        def calculate_all():
+            # Calcular as três métricas juntas sobre o mesmo DataFrame
+            return asyncio.gather(
+                metrics_tool.calculate_mortality_rate(test_data, "2023-06-15"),
+                metrics_tool.calculate_icu_occupancy_rate(test_data, "2023-06-15"),
+                metrics_tool.calculate_vaccination_rate(test_data, "2023-06-15")
+            )
+        
+        total_time = await _bench(calculate_all)
+        results = await calculate_all()
+        
+        # As três métricas devem ser calculadas em menos de 2 segundos
+        assert total_time < 2.0, f"Cálculo de métricas muito lento: {total_time}s"
+        assert all(isinstance(r, dict) for r in results)
     
-    def test_memory_usage_optimization(self, large_dataset):
+    def test_memory_usage_optimization(self, processor, wide_dataset):
         """Testa otimização de uso de memória."""
-        from src.data.processor import SRAGDataProcessor
-        
-        processor = SRAGDataProcessor()
-        
-        # Medir uso de memória antes
-        process = psutil.Process()
-        memory_before = process.memory_info().rss / 1024 / 1024  # MB
-        
-        # Processar dados (incluindo otimização de memória)
-        optimized_data = processor._optimize_memory_usage(large_dataset)
-        
-        # Forçar garbage collection
-        gc.collect()
-        
-        # Medir uso de memória depois
-        memory_after = process.memory_info().rss / 1024 / 1024  # MB
+        original_size = wide_dataset.memory_usage(deep=True).sum()
+        
+        optimized_data, peak = _optimize_traced(processor, wide_dataset)
+        optimized_size = optimized_data.memory_usage(deep=True).sum()
+        
+        # Colunas object e int64 devem ter sido reduzidas
+        assert optimized_size < original_size
+        assert optimized_data['NU_IDADE_N'].dtype == np.int8
+        assert isinstance(optimized_data['SG_UF'].dtype, pd.CategoricalDtype)
+        # Os valores não mudam, apenas a representação
+        pd.testing.assert_frame_equal(
+            optimized_data.astype(wide_dataset.dtypes.to_dict()), wide_dataset
+        )
+        # Otimização não deve duplicar o DataFrame inteiro em memória
+        assert peak < 2 * original_size
+    
+    def test_memory_usage_optimization_narrow_schema(self, processor, large_dataset):
+        """Testa otimização sobre o schema SRAG já reduzido (int8/category)."""
+        original_size = large_dataset.memory_usage(deep=True).sum()
         
-        # Verificar se otimização funcionou
-        original_size = large_dataset.memory_usage(deep=True).sum() / 1024 / 1024
-        optimized_size = optimized_data.memory_usage(deep=True).sum() / 1024 / 1024
+        optimized_data, peak = _optimize_traced(processor, large_dataset)
         
-        # Dados otimizados devem usar menos memória ou no máximo a mesma quantidade
-        assert optimized_size <= original_size * 1.1  # Tolerância de 10%
+        # Nada a reduzir: mesmos dtypes e valores, sem crescer em memória
+        pd.testing.assert_frame_equal(optimized_data, large_dataset)
+        assert optimized_data.memory_usage(deep=True).sum() <= original_size
+        assert peak < 2 * original_size
     
-    def test_validation_performance(self, large_dataset):
+    def test_validation_performance(self, validator, large_dataset):
         """Testa performance do sistema de validação."""
-        from src.data.validator import SRAGDataValidator
-        
-        validator = SRAGDataValidator()
-        
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = validator.validate_data_quality(large_dataset)
-        validation_time = time.time() - start_time
+        validation_time = time.perf_counter() - start_time
         
         # Validação deve ser rápida mesmo para datasets grandes
         assert validation_time < 10.0  # Menos de 10 segundos
@@ -125,33 +184,20 @@ class TestSystemPerformance:
         assert 'quality_score' in result
     
     @pytest.mark.asyncio
-    async def test_concurrent_operations(self):
+    async def test_concurrent_operations(self, metrics_tool, concurrent_datasets):
         """Testa operações concorrentes."""
-        from src.tools.metrics_tool import MetricsCalculatorTool
-        
-        # Criar múltiplos datasets pequenos
-        datasets = []
-        for i in range(5):
-            data = pd.DataFrame({
-                'DT_NOTIFIC': pd.date_range('2023-01-01', periods=1000, freq='H'),
-                'EVOLUCAO': np.random.choice(['1', '2'], 1000),
-                'UTI': np.random.choice(['1', '2'], 1000)
-            })
-            datasets.append(data)
-        
-        metrics_tool = MetricsCalculatorTool()
-        
-        # Executar cálculos concorrentemente
-        start_time = time.time()
+        datasets = concurrent_datasets
         
-        tasks = []
-        for i, data in enumerate(datasets):
-            task = metrics_tool.calculate_mortality_rate(data, "2023-06-15")
-            tasks.append(task)
+        tasks = [
+            metrics_tool.calculate_mortality_rate(data, "2023-06-15")
+            for data in datasets
+        ]
         
+        # Executar cálculos concorrentemente (cronômetro só em volta do gather)
+        start_time = time.perf_counter()
         results = await asyncio.gather(*tasks)
         
-        concurrent_time = time.time() - start_time
+        concurrent_time = time.perf_counter() - start_time
         
         # Execução concorrente deve ser mais eficiente que sequencial
         assert concurrent_time < 15.0  # Tempo razoável para 5 operações